@@ -0,0 +1,121 @@
+"""
+Benchmark and sanity check of the vectorized bootstrap (visualize/bootstrap_ci.py).
+
+Computes per-statement confidence intervals of the statement scores the
+notebooks' way (a Python loop of np.random.choice resamples per statement)
+and vectorized with index and Poisson resampling, and times
+individual_commonsensicality(n_boots=...). Checks that:
+- a seed reproduces the same intervals whatever the chunk size (max_cells);
+- the loop and vectorized intervals agree up to Monte Carlo noise;
+- the estimates fall inside their intervals.
+Exits non-zero if a check fails.
+
+Usage (from the repository root):
+    python .scripts/benchmarks/bench_bootstrap.py [n_ratings] [n_boots]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "visualize"))
+import utils  # noqa: E402
+from bench_individual_scores import make_ratings  # noqa: E402
+from bootstrap_ci import bootstrap_mean_difference  # noqa: E402
+from utils import individual_commonsensicality, statement_commonsensicality  # noqa: E402
+
+SCORES = ["consensus", "awareness", "commonsensicality"]
+# Loop and vectorized bounds are different Monte Carlo draws of the same quantiles
+MAX_MEDIAN_BOUND_GAP = 0.02
+
+
+def loop_ci(ratings, n_boots, ci=0.95, seed=0):
+    """Percentile intervals of the statement scores with a loop over resamples."""
+    rng = np.random.default_rng(seed)
+    alpha = (1 - ci) / 2
+    rows = {}
+    for statement, group in ratings.groupby("statementId"):
+        I_agree = group["I_agree"].to_numpy(dtype=float)
+        others_agree = group["others_agree"].to_numpy(dtype=float)
+        boots = {name: np.empty(n_boots) for name in SCORES}
+        for b in range(n_boots):
+            idx = rng.choice(len(group), len(group))
+            scores = utils._score_values(np.nanmean(I_agree[idx]), np.nanmean(others_agree[idx]))
+            for name in SCORES:
+                boots[name][b] = scores[name]
+        rows[statement] = {
+            f"{name}_ci_{side}": np.nanquantile(boots[name], q)
+            for name in SCORES
+            for side, q in [("low", alpha), ("high", 1 - alpha)]
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def main():
+    n_ratings = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_boots = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    ratings = make_ratings(n_ratings)
+    statements = statement_commonsensicality(ratings)
+    ok = True
+
+    with np.errstate(invalid="ignore"):
+        expected, t_loop = timed(lambda: loop_ci(ratings, n_boots))
+    index, t_index = timed(lambda: statement_commonsensicality(ratings, n_boots=n_boots))
+    poisson, t_poisson = timed(
+        lambda: utils._statement_ci(ratings, n_boots, 0.95, 0, method="poisson")
+    )
+    individual, t_individual = timed(
+        lambda: individual_commonsensicality(ratings, ratings, engine="numpy", n_boots=n_boots)
+    )
+
+    # Same seed, same output, whatever the chunk size
+    for method, out in [("index", index), ("poisson", poisson)]:
+        for max_cells in [1 << 16, 1 << 26]:
+            again = utils._statement_ci(
+                ratings, n_boots, 0.95, 0, method=method, max_cells=max_cells
+            )
+            ok &= np.array_equal(again.to_numpy(), out[again.columns].to_numpy(), equal_nan=True)
+
+    bounds = [f"{name}_ci_{side}" for name in SCORES for side in ["low", "high"]]
+    gap = max(
+        (out[bounds] - expected.loc[out.index, bounds]).abs().median().max()
+        for out in [index, poisson]
+    )
+    ok &= gap < MAX_MEDIAN_BOUND_GAP
+    for name in SCORES:
+        inside = index[f"{name}_ci_low"].le(statements[name]) & index[f"{name}_ci_high"].ge(
+            statements[name]
+        )
+        ok &= inside.mean() > 0.95
+
+    diff, t_diff = timed(
+        lambda: bootstrap_mean_difference(
+            statements["commonsensicality"][::2], statements["commonsensicality"][1::2], n_boots
+        )
+    )
+    ok &= np.isfinite(diff).all() and len(diff) == n_boots
+
+    print(f"ratings={n_ratings:,}  statements={len(statements):,}  n_boots={n_boots:,}")
+    print(f"  {'statement CIs, loop':<34}{t_loop:>8.2f} s")
+    print(f"  {'statement CIs, index matrix':<34}{t_index:>8.2f} s")
+    print(f"  {'statement CIs, Poisson weights':<34}{t_poisson:>8.2f} s")
+    print(f"  {'individual CIs, index matrix':<34}{t_individual:>8.2f} s")
+    print(f"  {'mean difference distribution':<34}{t_diff:>8.3f} s")
+    print(f"  median |vectorized - loop| bound gap={gap:.4f}")
+    print(f"checks_passed={ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark concurrent chunk reading (utils.load_data.read_table_chunks).
+
+Reads every CSV chunk of each table folder with 1, 2, 4 and 8 workers and
+reports the throughput in MB/s of CSV on disk.
+
+Usage (from the repository root):
+    python .scripts/benchmarks/bench_chunk_reader.py [folder ...]
+
+Folders default to answers/ and individuals/.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.load_data import DEFAULT_ENGINE, read_table_chunks  # noqa: E402
+
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def folder_size(folder):
+    return sum(
+        os.path.getsize(os.path.join(folder, f))
+        for f in os.listdir(folder)
+        if f.endswith(".csv")
+    )
+
+
+def main():
+    folders = sys.argv[1:] or ["answers", "individuals"]
+    print(f"engine={DEFAULT_ENGINE}")
+    for folder in folders:
+        if not os.path.isdir(folder):
+            print(f"{folder}: not found, skipping")
+            continue
+        size_mb = folder_size(folder) / 1e6
+        print(f"{folder}: {size_mb:,.1f} MB")
+        for workers in WORKER_COUNTS:
+            start = time.perf_counter()
+            df = read_table_chunks(folder, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(
+                f"  workers={workers}  {elapsed:7.2f} s  {size_mb / elapsed:8.1f} MB/s"
+                f"  ({len(df):,} rows)"
+            )
+
+
+if __name__ == "__main__":
+    main()
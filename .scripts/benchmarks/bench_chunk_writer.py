@@ -0,0 +1,184 @@
+"""
+Benchmark pull_data.save_dataframe_chunks against the previous row-by-row writer.
+
+Generates a synthetic answers-like table, writes it with both writers into
+temporary folders (with a small MAX_FILE_SIZE so several chunks are produced,
+including an append to a pre-existing chunk) and prints the timings.
+
+The previous writer is the original code, unchanged. It compares
+MAX_FILE_SIZE with the file size on disk, which lags behind its unflushed
+write buffer, and with the unquoted row plus "\n" rather than the line it
+writes, so its chunks overshoot the limit by up to the buffer size and split
+a few rows later. The new writer fills a chunk with whole lines up to
+MAX_FILE_SIZE bytes as written (quoted, CRLF) and closes it before the first
+line that would exceed it. The chunk layout therefore differs; the checks
+are that both writers produce the same rows in the same order under the same
+header, that no new chunk exceeds MAX_FILE_SIZE, and that every new chunk but
+the last is full (the next chunk's first line would not have fit).
+
+Usage (from the repository root):
+    python .scripts/benchmarks/bench_chunk_writer.py [n_rows]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pull_data  # noqa: E402
+
+
+def legacy_save_dataframe_chunks(df, folder_path, base_filename):
+    """The iterrows()-based writer save_dataframe_chunks replaced, verbatim."""
+    existing_files = [f for f in os.listdir(folder_path) if f.endswith(".csv")]
+
+    if not existing_files:
+        file_index = 1
+    else:
+        existing_files.sort(key=lambda x: int(x.split("_")[-1].split(".")[0]))
+        last_file = existing_files[-1]
+        file_index = int(last_file.split("_")[-1].split(".")[0])
+
+    while not df.empty:
+        file_path = os.path.join(folder_path, f"{base_filename}_{file_index}.csv")
+
+        if os.path.exists(file_path):
+            current_file_size = os.path.getsize(file_path)
+            if current_file_size < pull_data.MAX_FILE_SIZE:
+                file_mode = "a"
+                write_header = False
+            else:
+                file_index += 1
+                file_path = os.path.join(
+                    folder_path, f"{base_filename}_{file_index}.csv"
+                )
+                file_mode = "w"
+                write_header = True
+        else:
+            file_mode = "w"
+            write_header = True
+
+        with open(file_path, mode=file_mode, newline="", encoding="utf-8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=df.columns)
+            if write_header:
+                writer.writeheader()
+
+            total_rows_written = 0
+
+            for idx, row in df.iterrows():
+                row_dict = row.to_dict()
+                row_data = {
+                    key: "" if pd.isna(value) else str(value)
+                    for key, value in row_dict.items()
+                }
+                row_string = ",".join(row_data.values()) + "\n"
+                row_size = len(row_string.encode("utf-8"))
+
+                current_file_size = os.path.getsize(file_path)
+                if current_file_size + row_size > pull_data.MAX_FILE_SIZE:
+                    # Stop writing to this file and start a new one
+                    break
+
+                writer.writerow(row_data)
+                total_rows_written += 1
+
+            csvfile.flush()
+
+        # Remove the rows that have been written
+        df = df.iloc[total_rows_written:]
+        file_index += 1
+
+    print(f"Saved records to files in {folder_path}")
+
+
+def make_answers(n_rows, seed=0, n_sessions=None):
+    """Synthetic frame shaped like the answers table (ints, strings, NaN, dates)."""
+    rng = np.random.default_rng(seed)
+    n_sessions = n_sessions or n_rows
+    created = pd.Timestamp("2024-01-01") + pd.to_timedelta(
+        np.sort(rng.integers(0, 365 * 24 * 3600, n_rows)), unit="s"
+    )
+    others = rng.integers(0, 2, n_rows).astype(float)
+    others[rng.random(n_rows) < 0.01] = np.nan
+    return pd.DataFrame(
+        {
+            "id": np.arange(1, n_rows + 1),
+            "statementId": rng.integers(1, 10_000, n_rows),
+            "sessionId": [f"s{v:08x}" for v in rng.integers(0, n_sessions, n_rows)],
+            "I_agree": rng.integers(0, 2, n_rows),
+            "others_agree": others,
+            "origLanguage": rng.choice(["en", "es", 'say "hi", ok'], n_rows),
+            "createdAt": created,
+        }
+    )
+
+
+def run(writer, df, folder):
+    # Seed the folder with a partial first chunk so the append path is exercised
+    writer(df.iloc[:10], folder, "answers")
+    start = time.perf_counter()
+    writer(df.iloc[10:], folder, "answers")
+    return time.perf_counter() - start
+
+
+def read_folder(folder):
+    files = sorted(
+        (f for f in os.listdir(folder) if f.endswith(".csv")),
+        key=lambda f: int(f.split("_")[-1].split(".")[0]),
+    )
+    return {f: open(os.path.join(folder, f), "rb").read() for f in files}
+
+
+def split_chunks(files):
+    """(headers, data rows of all chunks concatenated) of a folder's chunks."""
+    headers, bodies = set(), []
+    for data in files.values():
+        header, _, body = data.partition(b"\n")
+        headers.add(header)
+        bodies.append(body)
+    return headers, b"".join(bodies)
+
+
+def chunks_full(files):
+    """Whether every chunk but the last could not have taken the next chunk's first line."""
+    chunks = list(files.values())
+    for data, following in zip(chunks, chunks[1:]):
+        first_line = following.partition(b"\n")[2].partition(b"\n")[0] + b"\n"
+        if len(data) + len(first_line) <= pull_data.MAX_FILE_SIZE:
+            return False
+    return True
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_answers(n_rows)
+    pull_data.MAX_FILE_SIZE = 4 * 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir:
+        t_old = run(legacy_save_dataframe_chunks, df, old_dir)
+        t_new = run(pull_data.save_dataframe_chunks, df, new_dir)
+        old_files, new_files = read_folder(old_dir), read_folder(new_dir)
+
+    same_rows = split_chunks(old_files) == split_chunks(new_files)
+    within_limit = all(len(data) <= pull_data.MAX_FILE_SIZE for data in new_files.values())
+    full = chunks_full(new_files)
+    overshoot = max(len(data) for data in old_files.values()) - pull_data.MAX_FILE_SIZE
+    print(
+        f"rows={n_rows:,}  chunks={len(new_files)} (legacy {len(old_files)})"
+        f"  identical_rows={same_rows}  new_chunks_within_limit={within_limit}"
+        f"  new_chunks_full={full}"
+    )
+    print(f"  legacy largest chunk over MAX_FILE_SIZE by {max(overshoot, 0):,} bytes")
+    print(f"  legacy (iterrows) : {t_old:8.2f} s")
+    print(f"  vectorized        : {t_new:8.2f} s  ({t_old / t_new:.1f}x)")
+    if not (same_rows and within_limit and full):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
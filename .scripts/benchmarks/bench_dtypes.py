@@ -0,0 +1,120 @@
+"""
+Benchmark the memory footprint of the compact dtype schema (utils.schema).
+
+Writes a synthetic answers table to a temporary CSV, loads it with pandas'
+inferred dtypes and again with TABLE_SCHEMAS["answers"] applied, and prints
+the in-memory size (deep) of each column and of the whole frame.
+
+It then writes the answers table's own columns (TABLE_SCHEMAS["answers"])
+as CHUNKS CSV chunks and reads them with load_data.read_table_chunks, which
+types every chunk as it is read, and by concatenating the untyped chunks and
+typing the result. Both use the C engine, whose allocations are all visible
+to tracemalloc (pyarrow allocates from its own pool), and the peak traced
+memory of each is printed. Exits non-zero if the frames differ.
+
+Usage (from the repository root):
+    python .scripts/benchmarks/bench_dtypes.py [n_rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bench_chunk_writer import make_answers  # noqa: E402
+from utils.load_data import iter_csv_chunks, read_table_chunks  # noqa: E402
+from utils.schema import TABLE_SCHEMAS, apply_schema  # noqa: E402
+
+CHUNKS = 24
+
+
+def mb(n_bytes):
+    return n_bytes / 1e6
+
+
+def peak_memory(fn):
+    """(result, peak traced memory in bytes) of fn()."""
+    tracemalloc.start()
+    try:
+        out = fn()
+        return out, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare_chunked_reads(df):
+    df = df.drop(columns="origLanguage")
+    df["updatedAt"] = df["createdAt"] + pd.Timedelta(seconds=5)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        folder = os.path.join(tmp_dir, "answers")
+        os.makedirs(folder)
+        bounds = np.linspace(0, len(df), CHUNKS + 1).astype(int)
+        for i in range(1, CHUNKS + 1):
+            chunk = df.iloc[bounds[i - 1] : bounds[i]]
+            chunk.to_csv(os.path.join(folder, f"answers_{i}.csv"), index=False)
+        # In the order read_table_chunks reads them
+        files = [os.path.join(folder, f) for f in sorted(os.listdir(folder))]
+
+        per_chunk, peak_per_chunk = peak_memory(
+            lambda: read_table_chunks(folder, engine="c")
+        )
+        after_concat, peak_after_concat = peak_memory(
+            lambda: apply_schema(
+                pd.concat(list(iter_csv_chunks(files, engine="c")), ignore_index=True),
+                TABLE_SCHEMAS["answers"],
+            )
+        )
+    same = per_chunk.equals(after_concat) and per_chunk.dtypes.equals(after_concat.dtypes)
+    print(f"  {CHUNKS} chunks, peak memory while reading:")
+    print(f"    schema after concat : {mb(peak_after_concat):8.1f} MB")
+    print(
+        f"    schema per chunk    : {mb(peak_per_chunk):8.1f} MB"
+        f"  ({peak_after_concat / peak_per_chunk:.1f}x lower)  identical_output={same}"
+    )
+    return same
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    # Real tables have far fewer sessions than rows (~100 answers per session)
+    df = make_answers(n_rows, n_sessions=max(1, n_rows // 100))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "answers_1.csv")
+        df.to_csv(path, index=False)
+
+        start = time.perf_counter()
+        inferred = pd.read_csv(path)
+        t_inferred = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compact = apply_schema(pd.read_csv(path), TABLE_SCHEMAS["answers"])
+        t_compact = time.perf_counter() - start
+
+    before = inferred.memory_usage(deep=True, index=False)
+    after = compact.memory_usage(deep=True, index=False)
+    print(f"rows={n_rows:,}")
+    print(f"  {'column':<14}{'inferred':>22}{'schema':>26}")
+    for col in inferred.columns:
+        print(
+            f"  {col:<14}"
+            f"{str(inferred[col].dtype):>10} {mb(before[col]):8.1f} MB"
+            f"{str(compact[col].dtype):>16} {mb(after[col]):8.1f} MB"
+        )
+    print(
+        f"  {'total':<14}{mb(before.sum()):19.1f} MB{mb(after.sum()):23.1f} MB"
+        f"  ({before.sum() / after.sum():.1f}x smaller)"
+    )
+    print(f"  load time: inferred {t_inferred:.2f} s, with schema {t_compact:.2f} s")
+    if not compare_chunked_reads(df):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
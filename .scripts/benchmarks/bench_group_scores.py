@@ -0,0 +1,106 @@
+"""
+Benchmark and parity check of the batched per-group scoring functions (visualize/utils.py).
+
+Scores every country of synthetic ratings with a loop of per-country calls
+(statement_commonsensicality, individual_commonsensicality against the
+country itself and against all ratings) and with the batched
+*_by_group functions, and checks that every country's rows are identical.
+
+Usage (from the repository root):
+    python .scripts/benchmarks/bench_group_scores.py [n_ratings] [n_countries]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "visualize"))
+from bench_individual_scores import make_ratings  # noqa: E402
+from utils import (  # noqa: E402
+    individual_commonsensicality,
+    individual_commonsensicality_by_group,
+    statement_commonsensicality,
+    statement_commonsensicality_by_group,
+)
+
+
+def per_country(ratings, score):
+    return pd.concat(
+        {
+            country: score(group)
+            for country, group in ratings.groupby("country_reside", observed=True)
+        },
+        names=["country_reside"],
+    )
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def main():
+    n_ratings = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_countries = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    ratings = make_ratings(n_ratings)
+    # A participant lives in one country
+    codes = ratings["sessionId"].cat.codes.to_numpy()
+    country = np.random.default_rng(1).integers(0, n_countries, codes.max() + 1)[codes]
+    ratings["country_reside"] = pd.Categorical([f"country-{c:03d}" for c in country])
+
+    cases = {
+        "statement scores": (
+            lambda: per_country(ratings, statement_commonsensicality),
+            lambda: statement_commonsensicality_by_group(ratings, "country_reside"),
+        ),
+        "individual, own ref": (
+            lambda: per_country(
+                ratings, lambda g: individual_commonsensicality(g, g, engine="numpy")
+            ),
+            lambda: individual_commonsensicality_by_group(ratings, "country_reside"),
+        ),
+        "individual, global ref": (
+            lambda: per_country(
+                ratings,
+                lambda g: individual_commonsensicality(g, ratings, engine="numpy"),
+            ),
+            lambda: individual_commonsensicality_by_group(
+                ratings, "country_reside", ratings
+            ),
+        ),
+    }
+
+    ok = True
+    print(f"ratings={n_ratings:,}  countries={n_countries}")
+    print(f"  {'case':<24}{'rows':>9}{'loop s':>9}{'batched s':>11}{'speedup':>9}")
+    for name, (loop, batched) in cases.items():
+        expected, t_loop = timed(loop)
+        result, t_batched = timed(batched)
+        try:
+            # pd.concat turns the group keys into a plain object column
+            pd.testing.assert_frame_equal(
+                result.reset_index().astype({"country_reside": object}),
+                expected.reset_index(),
+                check_exact=True,
+                check_categorical=False,
+            )
+        except AssertionError as exc:
+            print(exc)
+            ok = False
+        print(
+            f"  {name:<24}{len(result):>9,}{t_loop:>9.3f}{t_batched:>11.3f}"
+            f"{t_loop / t_batched:>8.1f}x"
+        )
+
+    print(f"identical_output={ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark and parity check of the individual_commonsensicality engines (visualize/utils.py).
+
+Generates synthetic ratings (categorical session ids, a share of missing
+others_agree) and scores them with engine="pandas" and engine="numpy", once
+against themselves and once against a reference subset (as /api/scores does
+for a target and a reference country). Exits non-zero if the engines'
+results differ.
+
+Usage (from the repository root):
+    python .scripts/benchmarks/bench_individual_scores.py [n_ratings]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "visualize"))
+from utils import individual_commonsensicality  # noqa: E402
+
+
+def make_ratings(n_ratings, seed=0):
+    rng = np.random.default_rng(seed)
+    n_sessions = max(1, n_ratings // 50)
+    n_statements = max(1, n_ratings // 300)
+    # Statements differ in how agreeable they are, so majority votes vary
+    p_agree = rng.random(n_statements)
+    statement = rng.integers(0, n_statements, n_ratings)
+    others_agree = (rng.random(n_ratings) < p_agree[statement]).astype(float)
+    others_agree[rng.random(n_ratings) < 0.02] = np.nan
+    return pd.DataFrame(
+        {
+            "sessionId": pd.Categorical(
+                [f"session-{i:08x}" for i in rng.integers(0, n_sessions, n_ratings)]
+            ),
+            "statementId": statement.astype("int32"),
+            "I_agree": (rng.random(n_ratings) < p_agree[statement]).astype("int8"),
+            "others_agree": others_agree,
+            "country": rng.integers(0, 10, n_ratings),
+        }
+    )
+
+
+def timed(fn, repeat=3):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def main():
+    n_ratings = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    ratings = make_ratings(n_ratings)
+    cases = {
+        "target = reference": (ratings, ratings),
+        "one country vs all": (ratings[ratings["country"] == 0], ratings),
+    }
+
+    ok = True
+    print(f"ratings={n_ratings:,}")
+    print(f"  {'case':<22}{'users':>8}{'pandas s':>10}{'numpy s':>10}{'speedup':>9}")
+    for name, (target, reference) in cases.items():
+        expected, t_pandas = timed(lambda: individual_commonsensicality(target, reference))
+        result, t_numpy = timed(
+            lambda: individual_commonsensicality(target, reference, engine="numpy")
+        )
+        try:
+            pd.testing.assert_frame_equal(result, expected, check_exact=True)
+        except AssertionError as exc:
+            print(exc)
+            ok = False
+        print(
+            f"  {name:<22}{len(result):>8,}{t_pandas:>10.3f}{t_numpy:>10.3f}"
+            f"{t_pandas / t_numpy:>8.1f}x"
+        )
+
+    print(f"identical_output={ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark the JSON encoding of the visualize server's payloads (visualize/json_payload.py).
+
+Builds synthetic tables shaped like the row lists of each endpoint and encodes
+them the old way (per-cell apply for nullable ints, DataFrame.round,
+to_dict(orient="records") and json.dumps) and with json_payload.frame_records
++ dumps, with the standard library encoder and with orjson when installed.
+Every encoding is checked to decode to the same JSON values as the old one,
+except that missing values are null instead of the old (invalid JSON) NaN.
+
+Usage (from the repository root):
+    python .scripts/benchmarks/bench_json_encoding.py [n_users] [n_statements]
+"""
+
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "visualize"))
+import json_payload  # noqa: E402
+from json_payload import frame_records  # noqa: E402
+
+PROP_COLS = ["fact", "physical", "literal_language", "positive", "knowledge", "everyday"]
+SCORE_COLS = ["consensus", "awareness", "commonsensicality"]
+
+
+def make_tables(n_users, n_statements, seed=0):
+    rng = np.random.default_rng(seed)
+    props = {
+        col: np.where(rng.random(n_statements) < 0.05, np.nan, rng.integers(0, 2, n_statements))
+        for col in PROP_COLS
+    }
+    statement_rows = pd.DataFrame(
+        {
+            "statementId": np.arange(n_statements),
+            "statement": [f"Statement number {i} about something" for i in range(n_statements)],
+            "n_ratings": rng.integers(10, 5000, n_statements),
+            "I_agree_mean": rng.random(n_statements),
+            "others_agree_mean": rng.random(n_statements),
+            **{col: rng.random(n_statements) for col in SCORE_COLS},
+            **props,
+        }
+    )
+    user_rows = pd.DataFrame(
+        {
+            "sessionId": [f"session-{i:08x}" for i in range(n_users)],
+            **{col: rng.random(n_users) for col in SCORE_COLS},
+            "n_statements": rng.integers(1, 100, n_users),
+            "country": rng.choice(["United States", "India", "Brazil", None], n_users),
+            "first_answer": "2024-01-01",
+            "last_answer": "2024-02-01",
+        }
+    )
+    return {
+        "/api/scores users": (user_rows, SCORE_COLS, []),
+        "/api/statement-scores rows": (
+            statement_rows,
+            ["I_agree_mean", "others_agree_mean"] + SCORE_COLS,
+            PROP_COLS,
+        ),
+        "/api/group-compare items": (
+            user_rows[["sessionId"] + SCORE_COLS],
+            SCORE_COLS,
+            [],
+        ),
+    }
+
+
+def nan_to_none(records):
+    return [
+        {k: None if isinstance(v, float) and math.isnan(v) else v for k, v in r.items()}
+        for r in records
+    ]
+
+
+def encode_old(df, float_cols, nullable_int_cols):
+    df = df.copy()
+    for col in nullable_int_cols:
+        df[col] = df[col].apply(lambda x: int(x) if pd.notna(x) else None)
+    df[float_cols] = df[float_cols].round(4)
+    return json.dumps(df.to_dict(orient="records"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_new(df, float_cols, nullable_int_cols):
+    return json_payload.dumps(frame_records(df, ndigits=4, ints=nullable_int_cols))
+
+
+def timed(fn, *args, repeat=3):
+    best, out = math.inf, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def main():
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    n_statements = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    tables = make_tables(n_users, n_statements)
+    orjson = json_payload.orjson
+
+    ok = True
+    print(f"users={n_users:,}  statements={n_statements:,}  orjson={orjson is not None}")
+    print(f"  {'payload':<28}{'old ms':>10}{'json ms':>10}{'orjson ms':>11}{'MB':>7}")
+    for name, args in tables.items():
+        old, t_old = timed(encode_old, *args)
+        expected = nan_to_none(json.loads(old))
+
+        json_payload.orjson = None
+        new, t_json = timed(encode_new, *args)
+        ok &= json.loads(new) == expected
+        json_payload.orjson = orjson
+
+        t_orjson = math.nan
+        if orjson is not None:
+            new, t_orjson = timed(encode_new, *args)
+            ok &= json.loads(new) == expected
+        print(
+            f"  {name:<28}{t_old * 1000:>10.1f}{t_json * 1000:>10.1f}"
+            f"{t_orjson * 1000:>11.1f}{len(old) / 1e6:>7.1f}"
+        )
+
+    print(f"identical_output={ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
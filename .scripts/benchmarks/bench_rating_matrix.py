@@ -0,0 +1,116 @@
+"""
+Benchmark and parity check of the sparse RatingMatrix (visualize/utils.py).
+
+Builds a RatingMatrix once from synthetic ratings and compares it with the
+long-frame functions: individual scores of every (target, reference) pair of
+a few countries via session masks against individual_commonsensicality on
+the filtered frames, and row (session) and column (statement) slices against
+boolean filtering of the frame. Exits non-zero if any result differs.
+
+Usage (from the repository root):
+    python .scripts/benchmarks/bench_rating_matrix.py [n_ratings]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "visualize"))
+from bench_individual_scores import make_ratings  # noqa: E402
+from utils import RatingMatrix, individual_commonsensicality  # noqa: E402
+
+N_COUNTRIES = 3
+N_SLICES = 200
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def main():
+    n_ratings = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    ratings = make_ratings(n_ratings)
+    # One country per session
+    ratings["country"] = ratings["sessionId"].cat.codes % N_COUNTRIES
+    pairs = [(t, r) for t in range(N_COUNTRIES) for r in [None, *range(N_COUNTRIES)]]
+
+    matrix, t_build = timed(lambda: RatingMatrix(ratings))
+    country_of = ratings.groupby("sessionId", observed=True)["country"].first()
+
+    def frames():
+        out = []
+        for target, reference in pairs:
+            target_ratings = ratings[ratings["country"] == target]
+            reference_ratings = (
+                ratings if reference is None else ratings[ratings["country"] == reference]
+            )
+            out.append(
+                individual_commonsensicality(target_ratings, reference_ratings, engine="numpy")
+            )
+        return out
+
+    def masks():
+        out = []
+        for target, reference in pairs:
+            target_sessions = matrix.session_mask(country_of.index[country_of == target])
+            reference_sessions = (
+                None
+                if reference is None
+                else matrix.session_mask(country_of.index[country_of == reference])
+            )
+            out.append(matrix.individual_commonsensicality(target_sessions, reference_sessions))
+        return out
+
+    expected, t_frames = timed(frames)
+    got, t_masks = timed(masks)
+    ok = all(a.equals(b) for a, b in zip(expected, got))
+
+    rng = np.random.default_rng(1)
+    session_ids = rng.choice(matrix.sessions, N_SLICES)
+    statement_ids = rng.choice(matrix.statements, N_SLICES)
+    cols = ["I_agree", "others_agree"]
+
+    def frame_slices():
+        rows = [ratings[ratings["sessionId"] == s] for s in session_ids]
+        columns = [ratings[ratings["statementId"] == s] for s in statement_ids]
+        return rows, columns
+
+    def matrix_slices():
+        rows = [matrix.session_ratings(s) for s in session_ids]
+        columns = [matrix.statement_ratings(s) for s in statement_ids]
+        return rows, columns
+
+    (frame_rows, frame_cols), t_frame_slices = timed(frame_slices)
+    (matrix_rows, matrix_cols), t_matrix_slices = timed(matrix_slices)
+    for frame_row, matrix_row in zip(frame_rows, matrix_rows):
+        frame_row = frame_row.sort_values("statementId", kind="stable")
+        ok &= np.array_equal(
+            frame_row[cols].to_numpy(float), matrix_row.to_numpy(), equal_nan=True
+        )
+        ok &= np.array_equal(frame_row["statementId"], matrix_row.index)
+    for frame_col, matrix_col in zip(frame_cols, matrix_cols):
+        frame_col = frame_col.sort_values("sessionId", kind="stable")
+        ok &= np.array_equal(
+            frame_col[cols].to_numpy(float), matrix_col.to_numpy(), equal_nan=True
+        )
+        ok &= np.array_equal(frame_col["sessionId"].astype(str), matrix_col.index.astype(str))
+
+    print(f"ratings={n_ratings:,}  sessions={matrix.shape[0]:,}  statements={matrix.shape[1]:,}")
+    print(f"  {'build matrix':<34}{t_build:>8.3f} s")
+    print(f"  {f'{len(pairs)} target/reference pairs, frames':<34}{t_frames:>8.3f} s")
+    print(f"  {f'{len(pairs)} target/reference pairs, masks':<34}{t_masks:>8.3f} s")
+    print(f"  {f'{2 * N_SLICES} slices, frame filters':<34}{t_frame_slices:>8.3f} s")
+    print(f"  {f'{2 * N_SLICES} slices, matrix':<34}{t_matrix_slices:>8.3f} s")
+    print(f"identical_output={ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark and parity check of incremental scoring (visualize/score_store.py).
+
+Builds a ScoreStore from synthetic answer rows, then updates it the way
+update-data.py does after a day of activity: answers appended with new ids
+(new sessions, re-answered statements, a burst flipping the majority vote of
+a few statements, some without I_agree), sessions that join or leave the
+scored set and sessions that change country. The store's scores are compared
+with a full recompute (ScoreStore.verify: individual_commonsensicality,
+statement_commonsensicality and statement_commonsensicality_by_group on the
+latest answers), and the update is timed against that recompute. Exits
+non-zero if they differ.
+
+Usage (from the repository root):
+    python .scripts/benchmarks/bench_score_store.py [n_ratings]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "visualize"))
+from bench_individual_scores import make_ratings  # noqa: E402
+from score_store import ScoreStore, latest_answers  # noqa: E402
+from utils import (  # noqa: E402
+    individual_commonsensicality,
+    statement_commonsensicality,
+    statement_commonsensicality_by_group,
+)
+
+COUNTRIES = np.array(["United States", "India", "Brazil", None], dtype=object)
+
+
+def make_answers(n_ratings, seed=0, first_id=1, start="2024-01-01"):
+    """
+    Answer rows with increasing ids and createdAt, like the raw answers table
+    (a session's answers are consecutive).
+    """
+    answers = make_ratings(n_ratings, seed).drop(columns="country")
+    answers["sessionId"] = answers["sessionId"].astype(str)
+    answers = answers.sort_values("sessionId", kind="stable", ignore_index=True)
+    answers["sessionId"] = answers["sessionId"].astype("category")
+    answers.insert(0, "id", np.arange(first_id, first_id + len(answers)))
+    answers["createdAt"] = pd.Timestamp(start) + pd.to_timedelta(
+        np.arange(len(answers)), unit="s"
+    )
+    return answers
+
+
+def day_of_activity(answers, countries, seed=1):
+    """
+    Answers and scored sessions after a day: 1% new answers (new sessions and
+    a burst flipping the majority vote of a few statements, 2% of them without
+    I_agree), re-answers by the sessions of the latest 1% of answers, and a few
+    sessions joining, leaving the scored set or changing country.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(answers)
+    next_id = int(answers["id"].max()) + 1
+    later = answers["createdAt"].max() + pd.Timedelta(days=1)
+
+    recent = answers.index[-(n // 100):]
+    reanswered = answers.loc[rng.choice(recent, n // 200, replace=False)].copy()
+    reanswered["others_agree"] = 1 - reanswered["others_agree"]
+
+    new = make_answers(n // 100, seed)
+    new["sessionId"] = "new-" + new["sessionId"].astype(str)
+    # Flip the majority vote of a few statements with a burst of opposite ratings
+    means = latest_answers(answers).groupby("statementId")["I_agree"].mean()
+    flipped = means[(means - 0.5).abs() < 0.02].index[:10]
+    burst = new.loc[new["statementId"].isin(flipped)].copy()
+    burst["I_agree"] = 1 - (means.reindex(burst["statementId"]).to_numpy() >= 0.5)
+    new = pd.concat([new.loc[~new["statementId"].isin(flipped)], burst])
+    new["I_agree"] = new["I_agree"].astype(float)
+    new.loc[rng.random(len(new)) < 0.02, "I_agree"] = np.nan
+
+    appended = pd.concat([reanswered, new], ignore_index=True)
+    appended["id"] = np.arange(next_id, next_id + len(appended))
+    appended["createdAt"] = later + pd.to_timedelta(np.arange(len(appended)), unit="s")
+    answers = pd.concat([answers, appended], ignore_index=True)
+    # The answers table is read with a categorical sessionId (TABLE_SCHEMAS)
+    answers["sessionId"] = answers["sessionId"].astype(str).astype("category")
+
+    sessions = countries.index.to_numpy()
+    left, moved = np.split(rng.choice(sessions, 20, replace=False), 2)
+    countries = countries.drop(left)
+    countries[moved] = "Brazil"
+    all_sessions = pd.Index(answers["sessionId"].unique())
+    joined = all_sessions.difference(countries.index)
+    countries = pd.concat(
+        [countries, pd.Series(rng.choice(COUNTRIES, len(joined)), index=joined)]
+    )
+    return answers, countries
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def full_recompute(ratings):
+    return (
+        individual_commonsensicality(ratings, ratings, engine="numpy"),
+        statement_commonsensicality(ratings),
+        statement_commonsensicality_by_group(ratings, "country_reside"),
+    )
+
+
+def scored_ratings(answers, countries):
+    ratings = latest_answers(answers[answers["sessionId"].isin(countries.index)])
+    return ratings.assign(country_reside=ratings["sessionId"].map(countries))
+
+
+def main():
+    n_ratings = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    answers = make_answers(n_ratings)
+    sessions = pd.Index(answers["sessionId"].unique())
+    # Some sessions are not scored yet (e.g. not matched), and join the next day
+    scored = sessions[rng.random(len(sessions)) < 0.99]
+    countries = pd.Series(rng.choice(COUNTRIES, len(scored)), index=scored)
+    updated, updated_countries = day_of_activity(answers, countries)
+
+    store = ScoreStore()
+    _, t_build = timed(lambda: store.update(answers, countries))
+    ok = store.verify(scored_ratings(answers, countries))
+    changed, t_update = timed(lambda: store.update(updated, updated_countries))
+    ratings = scored_ratings(updated, updated_countries)
+    _, t_full = timed(lambda: full_recompute(ratings))
+    _, t_read = timed(lambda: (store.individual_scores(), store.statement_scores()))
+    ok &= store.verify(ratings)
+
+    print(
+        f"answer rows={len(updated):,}  appended={len(updated) - len(answers):,}"
+        f"  re-tallied statements={len(changed)}"
+    )
+    print(f"  {'initial build':<24}{t_build:>8.2f} s")
+    print(f"  {'incremental update':<24}{t_update:>8.2f} s")
+    print(f"  {'read scores':<24}{t_read:>8.2f} s")
+    print(f"  {'full recompute':<24}{t_full:>8.2f} s")
+    print(f"identical_output={ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
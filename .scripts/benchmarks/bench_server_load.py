@@ -0,0 +1,93 @@
+"""
+Load test for the visualize server (visualize/server.py).
+
+Starts N concurrent clients that each send a mix of requests to a running
+server: cheap ones (/api/countries, static files) and expensive ones
+(/api/scores, /api/country-matrix). With --uncached, the expensive requests
+use a different date range every time so they miss the server's caches.
+Prints the p50 / p99 / max latency per endpoint and the overall throughput.
+
+Usage (with the server running, e.g. `python server.py 8080`):
+    python .scripts/benchmarks/bench_server_load.py [--url URL] [--clients N]
+        [--requests N] [--uncached]
+"""
+
+import argparse
+import random
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+
+import numpy as np
+
+CHEAP = ["/api/countries", "/static/style.css"]
+EXPENSIVE = [
+    "/api/scores?target=all&reference=all",
+    "/api/country-matrix",
+    "/api/statement-scores?country=all",
+]
+
+
+def _day(offset):
+    return time.strftime("%Y-%m-%d", time.gmtime(1704067200 + offset * 86400))
+
+
+def run_client(base_url, n_requests, uncached, seed, results, lock):
+    rng = random.Random(seed)
+    for _ in range(n_requests):
+        if rng.random() < 0.25:
+            path = rng.choice(EXPENSIVE)
+            if uncached:
+                sep = "&" if "?" in path else "?"
+                path = f"{path}{sep}date_from={_day(rng.randrange(300))}"
+        else:
+            path = rng.choice(CHEAP)
+        start = time.perf_counter()
+        with urllib.request.urlopen(base_url + path, timeout=600) as response:
+            response.read()
+        elapsed = time.perf_counter() - start
+        with lock:
+            results[path.split("?")[0]].append(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=20, help="per client")
+    parser.add_argument("--uncached", action="store_true")
+    args = parser.parse_args()
+
+    results = defaultdict(list)
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(args.url, args.requests, args.uncached, seed, results, lock),
+        )
+        for seed in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    n_total = sum(len(v) for v in results.values())
+    print(
+        f"clients={args.clients}  requests={n_total}  uncached={args.uncached}"
+        f"  wall={wall:.1f} s  throughput={n_total / wall:.1f} req/s"
+    )
+    print(f"  {'endpoint':<26}{'n':>6}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for path in sorted(results):
+        ms = np.array(results[path]) * 1000
+        print(
+            f"  {path:<26}{len(ms):>6}{np.percentile(ms, 50):>10.1f}"
+            f"{np.percentile(ms, 99):>10.1f}{ms.max():>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
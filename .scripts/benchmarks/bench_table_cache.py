@@ -0,0 +1,72 @@
+"""
+Benchmark the on-disk chunk cache of load_dataframes (utils.table_cache).
+
+Writes a synthetic answers table with pull_data.save_dataframe_chunks, then
+times a load without the cache, a cold cached load, a warm cached load, and a
+cached load after new rows were appended (only the grown and new chunks are
+parsed again). Every cached load is checked against the uncached one.
+
+Usage (from the repository root):
+    python .scripts/benchmarks/bench_table_cache.py [n_rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pull_data  # noqa: E402
+from bench_chunk_writer import make_answers  # noqa: E402
+from utils.load_data import load_dataframes  # noqa: E402
+
+
+def timed_load(folder, cache):
+    start = time.perf_counter()
+    df = load_dataframes(folder, cache=cache)
+    return df, time.perf_counter() - start
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    df = make_answers(n_rows, n_sessions=max(1, n_rows // 100))
+    n_old = n_rows - n_rows // 50
+    pull_data.MAX_FILE_SIZE = 16 * 1024 * 1024
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        folder = os.path.join(tmp_dir, "answers")
+        os.makedirs(folder)
+        pull_data.save_dataframe_chunks(df.iloc[:n_old], folder, "answers")
+        n_chunks = len([f for f in os.listdir(folder) if f.endswith(".csv")])
+
+        results = []
+        expected, t = timed_load(folder, cache=False)
+        results.append(("no cache", t))
+        for label in ("cold cache", "warm cache"):
+            cached, t = timed_load(folder, cache=True)
+            ok &= cached.equals(expected)
+            results.append((label, t))
+
+        # New rows grow the last chunk and may start new ones
+        pull_data.save_dataframe_chunks(df.iloc[n_old:], folder, "answers")
+        expected, _ = timed_load(folder, cache=False)
+        cached, t = timed_load(folder, cache=True)
+        ok &= cached.equals(expected)
+        results.append(("after append", t))
+        cached, t = timed_load(folder, cache=True)
+        ok &= cached.equals(expected)
+        results.append(("warm again", t))
+
+    print(f"rows={n_rows:,}  chunks={n_chunks}  identical_output={ok}")
+    for label, t in results:
+        print(f"  {label:<14}{t:8.2f} s")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
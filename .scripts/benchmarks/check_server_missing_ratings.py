@@ -0,0 +1,158 @@
+"""
+Check that the visualize server (visualize/server.py) starts and answers with
+answers whose I_agree is missing.
+
+Writes a synthetic DATA_DIR (answers.csv with a share of empty I_agree and
+others_agree, crt_rme_demo.csv, the repository's statement_properties.csv and
+a statements CSV), starts the server on it in a subprocess and requests
+/api/scores and the other endpoints that aggregate ratings. Exits non-zero if
+the server does not come up or an endpoint does not return JSON.
+
+Usage (from the repository root):
+    python .scripts/benchmarks/check_server_missing_ratings.py [n_sessions] [missing_share]
+"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+VISUALIZE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "visualize")
+COUNTRIES = ["United States", "India", "Brazil", "Germany"]
+N_STATEMENTS = 200
+RATINGS_PER_SESSION = 30
+STARTUP_TIMEOUT = 120
+
+
+def write_data_dir(data_dir, n_sessions, missing_share, seed=0):
+    """Synthetic answers, demographics and statements; returns (a sessionId, a statementId)."""
+    rng = np.random.default_rng(seed)
+    sessions = np.array([f"s{i:06d}" for i in range(n_sessions)])
+    pd.DataFrame(
+        {"sessionId": sessions, "country_reside": rng.choice(COUNTRIES, n_sessions)}
+    ).to_csv(os.path.join(data_dir, "crt_rme_demo.csv"), index=False)
+
+    statement_ids = np.concatenate(
+        [
+            rng.choice(np.arange(1, N_STATEMENTS + 1), RATINGS_PER_SESSION, replace=False)
+            for _ in range(n_sessions)
+        ]
+    )
+    p_agree = rng.random(N_STATEMENTS + 1)[statement_ids]
+    answers = pd.DataFrame(
+        {
+            "sessionId": np.repeat(sessions, RATINGS_PER_SESSION),
+            "statementId": statement_ids,
+            "I_agree": (rng.random(len(statement_ids)) < p_agree).astype(float),
+            "others_agree": (rng.random(len(statement_ids)) < p_agree).astype(float),
+            "createdAt": pd.Timestamp("2024-01-01")
+            + pd.to_timedelta(rng.integers(0, 300 * 86400, len(statement_ids)), unit="s"),
+        }
+    )
+    answers.loc[rng.random(len(answers)) < missing_share, "I_agree"] = np.nan
+    answers.loc[rng.random(len(answers)) < missing_share, "others_agree"] = np.nan
+    answers.sort_values("createdAt").to_csv(os.path.join(data_dir, "answers.csv"), index=False)
+
+    shutil.copy(os.path.join(VISUALIZE_DIR, "data", "statement_properties.csv"), data_dir)
+    pd.DataFrame(
+        {
+            "id": np.arange(1, N_STATEMENTS + 1),
+            "statement": [f"Statement {i}" for i in range(1, N_STATEMENTS + 1)],
+            "statementCategory": "synthetic",
+        }
+    ).to_csv(os.path.join(data_dir, "statements.csv"), index=False)
+
+    # A session with a missing I_agree, to exercise the user detail
+    missing = answers[answers["I_agree"].isna()]
+    return missing["sessionId"].iloc[0], int(missing["statementId"].iloc[0])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=120) as response:
+        return response.status, json.loads(response.read())
+
+
+def wait_until_up(server, base_url):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            return False
+        try:
+            get_json(base_url + "/api/countries")
+            return True
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.5)
+    return False
+
+
+def main():
+    n_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    missing_share = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        session_id, statement_id = write_data_dir(data_dir, n_sessions, missing_share)
+        port = free_port()
+        base_url = f"http://localhost:{port}"
+        env = dict(
+            os.environ,
+            DATA_DIR=data_dir,
+            STATEMENTS_PATH=os.path.join(data_dir, "statements.csv"),
+        )
+        server = subprocess.Popen(
+            [sys.executable, "server.py", str(port)],
+            cwd=VISUALIZE_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        try:
+            ok = wait_until_up(server, base_url)
+            print(f"sessions={n_sessions:,}  missing I_agree share={missing_share}")
+            print(f"  {'server started':<66}{ok}")
+            paths = [
+                "/api/scores?target=all&reference=all",
+                "/api/scores?target=India&reference=United%20States",
+                "/api/statements?country=all",
+                "/api/statement-scores?country=Brazil",
+                "/api/country-matrix",
+                f"/api/statement-countries?statementId={statement_id}",
+                f"/api/user-detail?userId={session_id}&reference=all&target=all",
+                "/api/group-compare?groupA=India&groupB=Germany",
+            ]
+            for path in paths if ok else []:
+                try:
+                    status, _ = get_json(base_url + path)
+                    passed = status == 200
+                except (urllib.error.URLError, ValueError) as exc:
+                    passed = False
+                    print(f"    {exc}")
+                print(f"  {path:<66}{passed}")
+                ok &= passed
+        finally:
+            server.terminate()
+            output, _ = server.communicate(timeout=30)
+        if not ok:
+            print(output)
+    print(f"checks_passed={ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
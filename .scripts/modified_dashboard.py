@@ -10,12 +10,7 @@ import plotly.io as pio
 from datetime import datetime
 
 
-from utils.load_data import (
-    load_answers,
-    load_individuals,
-    load_statements,
-    load_statements_properties,
-)
+from utils.load_data import scan_table
 
 
 COLOR_PALETTE = {
@@ -782,17 +777,13 @@ def generate_dashboard(sample_size=5000, start_date=None, end_date=None):
     """Main function to generate the dashboard"""
     print("Loading data...")
 
-    df_answers_pd = load_answers()
-    df_individuals_pd = load_individuals()
-    df_statements_pd = load_statements()
-    df_properties_pd = load_statements_properties()
+    df_answers = scan_table(
+        "answers",
+        columns=["sessionId", "statementId", "I_agree", "others_agree", "createdAt"],
+    ).collect(engine="streaming")
+    n_individuals = scan_table("individuals").select(pl.len()).collect().item()
 
-    df_answers = pl.from_pandas(df_answers_pd)
-    df_individuals = pl.from_pandas(df_individuals_pd)
-    df_statements = pl.from_pandas(df_statements_pd)
-    df_properties = pl.from_pandas(df_properties_pd)
-
-    print(f"Loaded {len(df_answers)} answers, {len(df_individuals)} individuals")
+    print(f"Loaded {len(df_answers)} answers, {n_individuals} individuals")
     print("Processing data...")
 
     df_final, df_session, df_joined = process_data(df_answers, start_date, end_date)
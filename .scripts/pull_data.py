@@ -6,13 +6,27 @@ and commits the changes to the local repo.
 import sys
 import os
 import json
-import csv
 import math
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import mysql.connector
+import mysql.connector.pooling
 import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 
+from utils.manifest import (
+    ChunkDigests,
+    build_manifest,
+    read_manifest,
+    rollback_to_manifest,
+    stale_files,
+    update_manifest,
+    write_manifest,
+)
+from utils.parquet_mirror import sync_parquet_mirror
+
 # Load environment variables
 load_dotenv()
 
@@ -31,6 +45,15 @@ MAX_FILE_SIZE = 90 * 1024 * 1024  # 50 MB in bytes
 # Metadata file to track last processed IDs
 METADATA_FILE = "./.scripts/metadata.json"
 
+# Rows fetched per page when streaming new records; 0 fetches the whole delta at once
+PAGE_SIZE = int(os.getenv("PULL_PAGE_SIZE", "50000"))
+
+# Number of tables pulled concurrently, each on its own pooled connection
+PULL_WORKERS = int(os.getenv("PULL_WORKERS", "1"))
+
+# Re-hash every chunk against its manifest entry when verifying metadata
+VERIFY_FULL = os.getenv("VERIFY_FULL", "0") == "1"
+
 
 class NpEncoder(json.JSONEncoder):
     """Custom JSON encoder for NumPy types."""
@@ -62,15 +85,28 @@ def load_metadata():
 
 
 def save_metadata(metadata):
-    """Save metadata to file."""
-    with open(METADATA_FILE, encoding="utf-8", mode="w") as f:
+    """Save metadata to file, replacing it atomically."""
+    tmp_file = METADATA_FILE + ".tmp"
+    with open(tmp_file, encoding="utf-8", mode="w") as f:
         json.dump(metadata, f, cls=NpEncoder, indent=2)
+    os.replace(tmp_file, METADATA_FILE)
 
 
-def get_new_records(connection, table, last_id):
-    """Fetch new records from the database for a specific table."""
-    query = f"SELECT * FROM {table} WHERE id > %s"
-    df = pd.read_sql(query, connection, params=(last_id,))
+def get_new_records(connection, table, last_id, limit=None):
+    """
+    Fetch new records from the database for a specific table.
+
+    With a limit, only the next `limit` records after last_id are fetched, in id
+    order (keyset pagination).
+    """
+    # sqlite3 (used as a local stand-in for the database) uses qmark parameters
+    placeholder = "?" if isinstance(connection, sqlite3.Connection) else "%s"
+    query = f"SELECT * FROM {table} WHERE id > {placeholder}"
+    params = (int(last_id),)
+    if limit:
+        query += f" ORDER BY id LIMIT {placeholder}"
+        params += (int(limit),)
+    df = pd.read_sql(query, connection, params=params)
 
     # Remove emails from urlParams column in experiments and individuals tables
     pattern = r"[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*@(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?"
@@ -80,6 +116,62 @@ def get_new_records(connection, table, last_id):
     return df
 
 
+def iter_new_records(connection, table, last_id, page_size=PAGE_SIZE):
+    """
+    Yield new records for a table page by page, each a DataFrame of at most
+    page_size rows in id order. A page_size of 0 yields the whole delta at once.
+    """
+    while True:
+        df = get_new_records(connection, table, last_id, page_size)
+        if df.empty:
+            return
+        yield df
+        if not page_size or len(df) < page_size:
+            return
+        last_id = df["id"].max()
+
+
+def pull_table(connection, table, metadata, metadata_lock=None):
+    """
+    Stream new records of a table into its CSV chunks.
+
+    Metadata is checkpointed after every page, so memory stays bounded by the
+    page size and an interrupted pull resumes from the last saved id. A page
+    is committed by the chunk manifest, which is written after the page's rows
+    and before the metadata; verify_metadata_with_files reconciles both on the
+    next run. When tables are pulled concurrently, metadata_lock guards the
+    shared metadata dict and file; each table only ever updates its own entry.
+    """
+    metadata_lock = metadata_lock or threading.Lock()
+    last_id = metadata.get(table, 0)
+    print(f"Processing table '{table}' from last_id {last_id}")
+
+    folder_path = table
+    n_records = 0
+    # Chunk hashes are carried from page to page instead of re-read from disk
+    digests = ChunkDigests()
+    for df in iter_new_records(connection, table, last_id):
+        os.makedirs(folder_path, exist_ok=True)
+
+        # Save DataFrame to CSV in chunks
+        save_dataframe_chunks(df, folder_path, table, digests)
+
+        with metadata_lock:
+            metadata[table] = df["id"].max()
+            save_metadata(metadata)
+        n_records += len(df)
+
+    if n_records == 0:
+        print(f"No new records found for table '{table}'")
+    else:
+        print(f"Saved {n_records} new records for table '{table}'")
+
+    # Keep the typed Parquet mirror in step with the CSV chunks
+    rebuilt = sync_parquet_mirror(table)
+    if rebuilt:
+        print(f"Updated Parquet mirror for table '{table}': {', '.join(rebuilt)}")
+
+
 def split_dataframe(df, chunk_size):
     """Split a DataFrame into smaller DataFrames of a specified size."""
     num_chunks = math.ceil(len(df) / chunk_size)
@@ -125,11 +217,73 @@ def get_last_id_from_files(table):
         return None
 
 
+def get_last_id_from_manifest(table, full_check=False):
+    """
+    Get the last 'id' of a table from its chunk manifest.
+
+    The manifest is checked against the chunks with one stat per file (or a
+    re-hash of every chunk with full_check). Returns None if the table has no
+    manifest, or if it is out of date; in the latter case a full check is fatal.
+    """
+    folder_path = table
+    if not os.path.exists(folder_path):
+        return None
+
+    manifest = read_manifest(folder_path)
+    if manifest is None or not manifest["files"]:
+        return None
+
+    stale = stale_files(folder_path, manifest, full=full_check)
+    if stale:
+        print(
+            f"Manifest of table '{table}' does not match files: {', '.join(stale)}"
+        )
+        if full_check:
+            sys.exit(1)
+        return None
+    return manifest["files"][-1]["max_id"]
+
+
+def recover_interrupted_pull(table):
+    """
+    Roll back rows of a table that an interrupted pull wrote but did not commit.
+
+    Rows written to the chunks after the manifest was last updated are removed,
+    so the chunks hold exactly the pages the manifest records.
+    """
+    if not os.path.exists(table):
+        return
+    manifest = read_manifest(table)
+    if manifest is None:
+        return
+    rolled_back = rollback_to_manifest(table, manifest)
+    if rolled_back:
+        print(
+            f"Rolled back uncommitted rows of table '{table}' in: {', '.join(rolled_back)}"
+        )
+
+
 def verify_metadata_with_files(metadata):
-    """Verify that the last id in the CSV files matches the metadata for each table."""
+    """
+    Verify that the last id in the CSV files matches the metadata for each table.
+
+    A pull interrupted after committing a page to the manifest but before saving
+    the metadata leaves the metadata behind the files; such entries are caught
+    up from the manifest and saved. Any other mismatch is fatal.
+    """
+    caught_up = False
     for table in TABLES:
+        recover_interrupted_pull(table)
         metadata_last_id = metadata.get(table, 0)
-        file_last_id = get_last_id_from_files(table)
+        file_last_id = get_last_id_from_manifest(table, full_check=VERIFY_FULL)
+        from_manifest = file_last_id is not None
+        if file_last_id is None:
+            # No usable manifest: fall back to reading the last chunk, and
+            # record a manifest for the next run
+            file_last_id = get_last_id_from_files(table)
+            if file_last_id is not None:
+                print(f"Building manifest for table '{table}'")
+                write_manifest(table, build_manifest(table))
         if file_last_id is None:
             # No data in files, so last_id should be zero or absent
             if metadata_last_id != 0:
@@ -137,20 +291,75 @@ def verify_metadata_with_files(metadata):
                     f"Error: Metadata last_id ({metadata_last_id}) does not match last id in files (None) for table '{table}'."
                 )
                 sys.exit(1)
+        elif from_manifest and metadata_last_id < file_last_id:
+            print(
+                f"Metadata last_id ({metadata_last_id}) is behind the manifest ({file_last_id}) for table '{table}'; resuming from the manifest."
+            )
+            metadata[table] = file_last_id
+            caught_up = True
         else:
             if metadata_last_id != file_last_id:
                 print(
                     f"Error: Metadata last_id ({metadata_last_id}) does not match last id in files ({file_last_id}) for table '{table}'."
                 )
                 sys.exit(1)
+    if caught_up:
+        save_metadata(metadata)
     print(
         "Metadata verification successful. Last ids in metadata match the CSV files for all tables."
     )
 
 
-def save_dataframe_chunks(df, folder_path, base_filename):
+def _serialize_rows(df):
+    """
+    Serialize every row of a DataFrame to a CSV line in one pass.
+
+    Cells are formatted exactly like the csv.DictWriter path used to write them
+    (str() of the value, "" for missing values, minimal quoting, CRLF line
+    terminator), but column by column instead of row by row. Values are taken
+    from df.to_numpy() so mixed/numeric frames are upcast the same way
+    df.iterrows() upcasts them.
+
+    Returns:
+        np.ndarray: Object array with one CSV line per row.
+    """
+    values = df.to_numpy()
+    line = None
+    for j in range(values.shape[1]):
+        col = values[:, j]
+        field = pd.Series(col.astype(str), dtype=object)
+        field[pd.isna(col)] = ""
+        if df.dtypes.iloc[j] != object:
+            # str() of numbers, booleans and timestamps never needs quoting
+            line = field if line is None else line + "," + field
+            continue
+        needs_quotes = field.str.contains(r'[,"\r\n]', regex=True)
+        if needs_quotes.any():
+            field = field.copy()
+            field[needs_quotes] = (
+                '"' + field[needs_quotes].str.replace('"', '""', regex=False) + '"'
+            )
+        line = field if line is None else line + "," + field
+    if values.shape[1] == 1:
+        # csv quotes a lone empty field so the row is not mistaken for a blank line
+        line = line.where(line != "", '""')
+    return (line + "\r\n").to_numpy()
+
+
+def _serialize_header(columns):
+    """Serialize the header row the same way csv.DictWriter.writeheader does."""
+    return _serialize_rows(pd.DataFrame([list(columns)], dtype=object))[0]
+
+
+def save_dataframe_chunks(df, folder_path, base_filename, digests=None):
     """
     Save DataFrame to CSV files, appending to existing files if under MAX_FILE_SIZE.
+
+    All rows are serialized up front and their byte sizes are computed in bulk,
+    so the split points are found from the precomputed sizes and each file is
+    filled with a single write. With digests (a utils.manifest.ChunkDigests
+    shared by the pages of a pull), the manifest hashes of the chunks are
+    updated from the bytes written instead of re-reading the chunks.
     """
     existing_files = [f for f in os.listdir(folder_path) if f.endswith(".csv")]
 
@@ -161,56 +370,109 @@ def save_dataframe_chunks(df, folder_path, base_filename):
         last_file = existing_files[-1]
         file_index = int(last_file.split("_")[-1].split(".")[0])
 
-    while not df.empty:
+    lines = _serialize_rows(df)
+    row_sizes = (
+        pd.Series(lines, dtype=object).str.encode("utf-8").str.len().to_numpy(dtype=np.int64)
+    )
+    # Bytes written by earlier rows of the frame, per row
+    written_before = np.concatenate(([0], np.cumsum(row_sizes)))
+    header = _serialize_header(df.columns).encode("utf-8")
+
+    written = {}
+    start = 0
+    while start < len(lines):
         file_path = os.path.join(folder_path, f"{base_filename}_{file_index}.csv")
 
         if os.path.exists(file_path):
             current_file_size = os.path.getsize(file_path)
             if current_file_size < MAX_FILE_SIZE:
-                file_mode = "a"
+                file_mode = "ab"
                 write_header = False
             else:
                 file_index += 1
                 file_path = os.path.join(
                     folder_path, f"{base_filename}_{file_index}.csv"
                 )
-                file_mode = "w"
+                current_file_size = 0
+                file_mode = "wb"
                 write_header = True
         else:
-            file_mode = "w"
+            current_file_size = 0
+            file_mode = "wb"
             write_header = True
 
-        with open(file_path, mode=file_mode, newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=df.columns)
+        if write_header:
+            current_file_size += len(header)
+
+        # A row is written while the file size so far plus the bytes of its
+        # line stay within MAX_FILE_SIZE; the file is closed at the first row
+        # that does not fit, so a chunk never exceeds MAX_FILE_SIZE.
+        file_size_before = (
+            current_file_size
+            + written_before[start : len(lines)]
+            - written_before[start]
+        )
+        overflow = file_size_before + row_sizes[start:] > MAX_FILE_SIZE
+        stop = start + (int(overflow.argmax()) if overflow.any() else len(overflow))
+        if stop == start and write_header:
+            # A single row larger than MAX_FILE_SIZE still gets its own file
+            stop = start + 1
+
+        body = "".join(lines[start:stop]).encode("utf-8")
+        with open(file_path, mode=file_mode) as csvfile:
             if write_header:
-                writer.writeheader()
+                csvfile.write(header)
+            csvfile.write(body)
+        if digests is not None:
+            digests.appended(file_path, header + body if write_header else body)
+
+        written[os.path.basename(file_path)] = df.iloc[start:stop]
+        start = stop
+        file_index += 1
 
-            total_rows_written = 0
+    update_manifest(folder_path, written, digests)
+    print(f"Saved records to files in {folder_path}")
 
-            for idx, row in df.iterrows():
-                row_dict = row.to_dict()
-                row_data = {
-                    key: "" if pd.isna(value) else str(value)
-                    for key, value in row_dict.items()
-                }
-                row_string = ",".join(row_data.values()) + "\n"
-                row_size = len(row_string.encode("utf-8"))
 
-                current_file_size = os.path.getsize(file_path)
-                if current_file_size + row_size > MAX_FILE_SIZE:
-                    # Stop writing to this file and start a new one
-                    break
+def pull_tables_concurrently(metadata, workers):
+    """
+    Pull all TABLES concurrently, one worker per table, on a shared connection pool.
 
-                writer.writerow(row_data)
-                total_rows_written += 1
+    A failing table does not stop the others: its metadata entry stays at the
+    last page it committed, and the failure is reported once all workers finish.
 
-            csvfile.flush()
+    Returns:
+        list: Names of the tables that failed.
+    """
+    pool = mysql.connector.pooling.MySQLConnectionPool(
+        pool_name="pull_data",
+        pool_size=min(workers, len(TABLES)),
+        user=DB_USER,
+        password=DB_PASSWORD,
+        host=DB_HOST,
+        database=DB_NAME,
+    )
+    metadata_lock = threading.Lock()
 
-        # Remove the rows that have been written
-        df = df.iloc[total_rows_written:]
-        file_index += 1
+    def worker(table):
+        connection = pool.get_connection()
+        try:
+            pull_table(connection, table, metadata, metadata_lock)
+        finally:
+            # Returns the connection to the pool
+            connection.close()
 
-    print(f"Saved records to files in {folder_path}")
+    failed = []
+    with ThreadPoolExecutor(max_workers=min(workers, len(TABLES))) as executor:
+        futures = {executor.submit(worker, table): table for table in TABLES}
+        for future in as_completed(futures):
+            table = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error processing table '{table}': {e}")
+                failed.append(table)
+    return failed
 
 
 def main():
@@ -222,6 +484,18 @@ def main():
     # Verify that last ids in metadata match the last ids in CSV files
     verify_metadata_with_files(metadata)
 
+    if PULL_WORKERS > 1:
+        try:
+            failed = pull_tables_concurrently(metadata, PULL_WORKERS)
+        except mysql.connector.Error as e:
+            print(f"Error connecting to MariaDB Platform: {e}")
+            sys.exit(1)
+        if failed:
+            print(f"Failed to process tables: {', '.join(sorted(failed))}")
+            sys.exit(1)
+        print("All tables processed successfully")
+        return
+
     try:
         connection = mysql.connector.connect(
             user=DB_USER,
@@ -231,28 +505,9 @@ def main():
         )
 
         for table in TABLES:
-            last_id = metadata.get(table, 0)
-            print(f"Processing table '{table}' from last_id {last_id}")
-
-            # Fetch new records
-            df = get_new_records(connection, table, last_id)
-
-            if df.empty:
-                print(f"No new records found for table '{table}'")
-                continue
-
-            max_id = df["id"].max()
-            metadata[table] = max_id
-
-            folder_path = table
-            os.makedirs(folder_path, exist_ok=True)
-
-            # Save DataFrame to CSV in chunks
-            save_dataframe_chunks(df, folder_path, table)
+            pull_table(connection, table, metadata)
 
         print("All tables processed successfully")
-        # Save updated metadata
-        save_metadata(metadata)
 
         # Close the database connection
         connection.close()
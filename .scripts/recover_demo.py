@@ -54,6 +54,8 @@ import pandas as pd
 from scipy.optimize import linear_sum_assignment
 from tqdm import tqdm
 
+from utils.load_data import read_table_chunks
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Tuneable parameters
 # ─────────────────────────────────────────────────────────────────────────────
@@ -73,11 +75,7 @@ print("LOADING DATA\n")
 
 
 def _read_csvs(base_path):
-    files = sorted(f for f in os.listdir(base_path) if f.endswith(".csv"))
-    return pd.concat(
-        [pd.read_csv(os.path.join(base_path, f)) for f in files],
-        ignore_index=True,
-    )
+    return read_table_chunks(base_path)
 
 
 # — Answers ——————————————————————————————————————————————————————————————————
@@ -88,7 +86,9 @@ df_answers["createdAt"] = pd.to_datetime(df_answers["createdAt"])
 # Keep only sessions with enough answers; retain the *last* answer per session.
 # The createdAt of the last answer is the best proxy for when the participant
 # finished the rating task and moved on to the CRT.
-session_counts = df_answers.groupby("sessionId")["createdAt"].count()
+session_counts = (
+    df_answers.groupby("sessionId", observed=True)["createdAt"].count()
+)
 df_answers = df_answers[
     df_answers["sessionId"].isin(
         session_counts[session_counts >= MIN_ANSWERS].index
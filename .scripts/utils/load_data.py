@@ -3,44 +3,314 @@
 """
 
 import os
-from typing import Optional
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Union
 
 import pandas as pd
 
+try:
+    from .manifest import chunk_index, read_manifest
+    from .parquet_mirror import mirror_covers, mirror_files
+    from .schema import TIMESTAMP, TABLE_SCHEMAS, apply_schema
+    from .table_cache import iter_cached_chunks
+except ImportError:
+    from manifest import chunk_index, read_manifest
+    from parquet_mirror import mirror_covers, mirror_files
+    from schema import TIMESTAMP, TABLE_SCHEMAS, apply_schema
+    from table_cache import iter_cached_chunks
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import pyarrow  # noqa: F401
+
+    DEFAULT_ENGINE = "pyarrow"
+except ImportError:
+    DEFAULT_ENGINE = "c"
+
+# Number of chunk files read concurrently
+LOAD_WORKERS = int(os.environ.get("LOAD_DATA_WORKERS", min(8, os.cpu_count() or 1)))
+# Serve load_dataframes from the on-disk chunk cache (utils.table_cache)
+LOAD_CACHE = os.environ.get("LOAD_DATA_CACHE", "0") == "1"
+
+# `date` values that are a prefix of an ISO timestamp (YYYY, YYYY-MM, YYYY-MM-DD)
+_ISO_DATE_PREFIX = re.compile(r"^\d{4}(-\d{2}(-\d{2})?)?$")
+
+
+def _chunk_may_match(
+    entry: dict,
+    date: Optional[str],
+    date_from: Optional[pd.Timestamp],
+    date_end: Optional[pd.Timestamp],
+) -> bool:
+    """Whether a chunk's manifest entry allows rows matching the date filters."""
+    lo, hi = entry.get("min_createdAt"), entry.get("max_createdAt")
+    if lo is None or hi is None:
+        return True
+    if date_from is not None and pd.Timestamp(hi) < date_from:
+        return False
+    if date_end is not None and pd.Timestamp(lo) >= date_end:
+        return False
+    if date and _ISO_DATE_PREFIX.match(date):
+        return lo[: len(date)] <= date <= hi[: len(date)]
+    return True
+
+
+def _read_csv(
+    path: str, engine: str, schema: Optional[Dict[str, str]] = None, **kwargs
+) -> pd.DataFrame:
+    df = None
+    if engine == "pyarrow":
+        try:
+            df = pd.read_csv(path, engine="pyarrow", **kwargs)
+        except ValueError:
+            # Options pandas does not support with the pyarrow engine, or data
+            # the pyarrow parser rejects (pyarrow.lib.ArrowInvalid is a
+            # ValueError); anything else, e.g. a missing file, is raised as is
+            pass
+    if df is None:
+        df = pd.read_csv(path, **kwargs)
+    return apply_schema(df, schema) if schema else df
+
+
+def _concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate frames, keeping categorical columns categorical."""
+    first = frames[0]
+    cat_cols = [
+        c for c in first.columns if isinstance(first[c].dtype, pd.CategoricalDtype)
+    ]
+    if len(frames) > 1 and cat_cols:
+        # pd.concat falls back to object for categoricals with differing
+        # categories, so every frame is given the union of the categories
+        # first; only the codes are remapped, the other columns are not copied
+        with pd.option_context("mode.chained_assignment", None):
+            for col in cat_cols:
+                categories = first[col].cat.categories
+                for f in frames[1:]:
+                    categories = categories.union(f[col].cat.categories)
+                for f in frames:
+                    f[col] = f[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True, copy=False)
+
+
+def iter_csv_chunks(
+    files: List[str],
+    workers: Optional[int] = None,
+    engine: Optional[str] = None,
+    schema: Optional[Dict[str, str]] = None,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read CSV files concurrently and yield them as DataFrames in file order.
+
+    At most `workers` files are read ahead of the consumer, so stopping the
+    iteration early leaves the remaining files unread.
+
+    Args:
+        files (List[str]): Paths of the CSV files.
+        workers (Optional[int]): Number of files read concurrently. Defaults to
+            LOAD_WORKERS (env LOAD_DATA_WORKERS).
+        engine (Optional[str]): pandas CSV engine. Defaults to "pyarrow" when
+            pyarrow is installed, falling back to the C engine per file.
+        schema (Optional[Dict[str, str]]): Cast every chunk to these compact
+            types (utils.schema.apply_schema) as soon as it is read, so the
+            untyped frame of at most `workers` chunks is held at a time.
+        **kwargs: Passed to pd.read_csv.
+    """
+    workers = max(1, workers or LOAD_WORKERS)
+    engine = engine or DEFAULT_ENGINE
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        remaining = iter(files)
+        try:
+            for f in remaining:
+                pending.append(executor.submit(_read_csv, f, engine, schema, **kwargs))
+                if len(pending) >= workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def read_csv_chunks(
+    files: List[str],
+    workers: Optional[int] = None,
+    engine: Optional[str] = None,
+    schema: Optional[Dict[str, str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Read CSV files concurrently and concatenate them in file order.
+
+    Args:
+        files (List[str]): Paths of the CSV files.
+        workers (Optional[int]): Number of files read concurrently.
+        engine (Optional[str]): pandas CSV engine (see iter_csv_chunks).
+        schema (Optional[Dict[str, str]]): Cast every chunk to these types as
+            it is read (see iter_csv_chunks).
+        **kwargs: Passed to pd.read_csv.
+
+    Returns:
+        pd.DataFrame: Concatenated DataFrame with a fresh RangeIndex.
+    """
+    frames = list(iter_csv_chunks(files, workers, engine, schema, **kwargs))
+    return _concat_frames(frames)
+
+
+def read_table_chunks(
+    base_path: str, workers: Optional[int] = None, schema: bool = True, **kwargs
+) -> pd.DataFrame:
+    """
+    Read every CSV file of a table folder concurrently, in sorted file name order.
+
+    Args:
+        base_path (str): Directory containing CSV files.
+        workers (Optional[int]): Number of files read concurrently.
+        schema (bool): Cast columns to the table's compact types (utils.schema),
+            chunk by chunk as they are read.
+        **kwargs: Passed to read_csv_chunks / pd.read_csv.
+
+    Returns:
+        pd.DataFrame: Concatenated DataFrame.
+    """
+    table = os.path.basename(os.path.normpath(base_path))
+    files = sorted(f for f in os.listdir(base_path) if f.endswith(".csv"))
+    files = [os.path.join(base_path, f) for f in files]
+    table_schema = TABLE_SCHEMAS.get(table, {}) if schema else None
+    df = read_csv_chunks(files, workers, schema=table_schema, **kwargs)
+    if schema:
+        # Chunks are already typed and their categories unioned; this only
+        # reconciles columns whose type differs between chunks
+        apply_schema(df, table_schema)
+    return df
+
 
 def load_dataframes(
-    base_path: str, date: Optional[str] = None, num_samples: Optional[int] = None
+    base_path: str,
+    date: Optional[str] = None,
+    num_samples: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    where: Optional[Union[str, Callable[[pd.DataFrame], pd.Series]]] = None,
+    workers: Optional[int] = None,
+    cache: Optional[bool] = None,
 ) -> pd.DataFrame:
     """
     Load and concatenate CSV files from a directory.
     Only loads files named after the folder with _<number>.csv suffix.
     Optionally filter rows by date in the 'createdAt' column and/or limit number of samples.
 
+    Columns are cast to the table's compact types (utils.schema), chunk by chunk.
+    Chunk files are read concurrently and filtered as they arrive. Chunks whose manifest
+    entry shows they hold no rows in the requested date range are not read, and
+    reading stops as soon as num_samples rows have been collected.
+
+    With the cache enabled, typed chunks are read from a local binary cache and only
+    chunks that are new or changed since the last load are parsed (utils.table_cache).
+
     Args:
         base_path (str): Directory containing CSV files.
         date (Optional[str]): Only include rows where 'createdAt' contains this date string.
         num_samples (Optional[int]): Limit to first N rows after filtering.
+        columns (Optional[List[str]]): Only read these columns.
+        date_from (Optional[str]): Only include rows created on or after this date.
+        date_to (Optional[str]): Only include rows created on or before this date (inclusive).
+        where (Optional[Union[str, Callable]]): Row filter, either a DataFrame.query
+            expression or a function returning a boolean mask. It sees only the
+            columns being read, so list the columns it uses in `columns`.
+        workers (Optional[int]): Number of chunk files read concurrently.
+        cache (Optional[bool]): Use the on-disk chunk cache. Defaults to
+            LOAD_CACHE (env LOAD_DATA_CACHE=1).
 
     Returns:
         pd.DataFrame: Concatenated DataFrame.
     """
+    if cache is None:
+        cache = LOAD_CACHE
     folder_name = os.path.basename(os.path.normpath(base_path))
     files = sorted(os.listdir(base_path))
     files = [f for f in files if f.startswith(folder_name + "_") and f.endswith(".csv")]
+
+    date_from_ts = pd.Timestamp(date_from) if date_from else None
+    date_end_ts = pd.Timestamp(date_to) + pd.Timedelta(days=1) if date_to else None
+    manifest = read_manifest(base_path)
+    if manifest is not None:
+        entries = {e["file"]: e for e in manifest["files"]}
+        files = [
+            f
+            for f in files
+            if f not in entries
+            or _chunk_may_match(entries[f], date, date_from_ts, date_end_ts)
+        ]
+
     files = [os.path.join(base_path, f) for f in files]
     print(f"Loading files from {base_path}:")
     for file in files:
         print("  -", file)
-    df = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
-    if date:
-        df = df[df["createdAt"].astype(str).str.contains(date)]
+
+    filter_by_date = bool(date or date_from or date_to)
+    usecols = None
+    if columns is not None:
+        usecols = list(columns)
+        if filter_by_date and "createdAt" not in usecols:
+            usecols.append("createdAt")
+
+    schema = TABLE_SCHEMAS.get(folder_name, {})
+    if cache:
+        chunks = iter_cached_chunks(files, iter_csv_chunks, workers)
+        if usecols is not None:
+            # Cached chunks hold every column
+            chunks = (df[usecols] for df in chunks)
+    else:
+        chunks = iter_csv_chunks(files, workers, usecols=usecols)
+
+    frames = []
+    n_rows = 0
+    for df in chunks:
+        if filter_by_date:
+            created = df["createdAt"]
+            if date:
+                df = df[created.astype(str).str.contains(date)]
+                created = df["createdAt"]
+            if date_from_ts is not None or date_end_ts is not None:
+                created = pd.to_datetime(created)
+                mask = pd.Series(True, index=df.index)
+                if date_from_ts is not None:
+                    mask &= created >= date_from_ts
+                if date_end_ts is not None:
+                    mask &= created < date_end_ts
+                df = df[mask]
+        if where is not None:
+            df = df.query(where) if isinstance(where, str) else df[where(df)]
+        if not cache:
+            # Only typed chunks are kept until the concat (cached chunks already are)
+            df = apply_schema(df.copy(deep=False), schema)
+        frames.append(df)
+        n_rows += len(df)
+        if num_samples is not None and n_rows >= num_samples:
+            break
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    df = _concat_frames(frames)
+    if columns is not None:
+        df = df[list(columns)]
     if num_samples is not None:
         df = df.head(num_samples)
-    return df
+    # Reconciles columns whose type differs between chunks
+    return apply_schema(df, schema)
 
 
 def load_individuals(
-    date: Optional[str] = None, num_samples: Optional[int] = None
+    date: Optional[str] = None, num_samples: Optional[int] = None, **kwargs
 ) -> pd.DataFrame:
     """
     Loads individual data samples from the specified directory.
@@ -50,15 +320,16 @@ def load_individuals(
             If None, loads data from all dates.
         num_samples (Optional[int]): The number of samples to load.
             If None, loads all available samples.
+        **kwargs: Further options of load_dataframes (columns, date_from, date_to, where).
 
     Returns:
         pd.DataFrame: A DataFrame containing the loaded individual data samples.
     """
-    return load_dataframes("../individuals", date, num_samples)
+    return load_dataframes("../individuals", date, num_samples, **kwargs)
 
 
 def load_answers(
-    date: Optional[str] = None, num_samples: Optional[int] = None
+    date: Optional[str] = None, num_samples: Optional[int] = None, **kwargs
 ) -> pd.DataFrame:
     """
     Loads answer data samples from the specified directory.
@@ -68,14 +339,15 @@ def load_answers(
             If None, loads data from all dates.
         num_samples (Optional[int]): The number of samples to load.
             If None, loads all available samples.
+        **kwargs: Further options of load_dataframes (columns, date_from, date_to, where).
     Returns:
         pd.DataFrame: A DataFrame containing the loaded answer data samples.
     """
-    return load_dataframes("../answers", date, num_samples)
+    return load_dataframes("../answers", date, num_samples, **kwargs)
 
 
 def load_statements(
-    date: Optional[str] = None, num_samples: Optional[int] = None
+    date: Optional[str] = None, num_samples: Optional[int] = None, **kwargs
 ) -> pd.DataFrame:
     """
     Loads statement data samples from the specified directory.
@@ -85,15 +357,16 @@ def load_statements(
             If None, loads data from all dates.
         num_samples (Optional[int]): The number of samples to load.
             If None, loads all available samples.
+        **kwargs: Further options of load_dataframes (columns, date_from, date_to, where).
 
     Returns:
         pd.DataFrame: A DataFrame containing the loaded statement data samples.
     """
-    return load_dataframes("../statements", date, num_samples)
+    return load_dataframes("../statements", date, num_samples, **kwargs)
 
 
 def load_statements_properties(
-    date: Optional[str] = None, num_samples: Optional[int] = None
+    date: Optional[str] = None, num_samples: Optional[int] = None, **kwargs
 ) -> pd.DataFrame:
     """
     Loads statement properties data samples from the specified directory.
@@ -103,15 +376,16 @@ def load_statements_properties(
             If None, loads data from all dates.
         num_samples (Optional[int]): The number of samples to load.
             If None, loads all available samples.
+        **kwargs: Further options of load_dataframes (columns, date_from, date_to, where).
 
     Returns:
         pd.DataFrame: A DataFrame containing the loaded statement properties data samples.
     """
-    return load_dataframes("../statementproperties", date, num_samples)
+    return load_dataframes("../statementproperties", date, num_samples, **kwargs)
 
 
 def load_experiments(
-    date: Optional[str] = None, num_samples: Optional[int] = None
+    date: Optional[str] = None, num_samples: Optional[int] = None, **kwargs
 ) -> pd.DataFrame:
     """
     Loads experiment data samples from the specified directory.
@@ -121,8 +395,76 @@ def load_experiments(
             If None, loads data from all dates.
         num_samples (Optional[int]): The number of samples to load.
             If None, loads all available samples.
+        **kwargs: Further options of load_dataframes (columns, date_from, date_to, where).
 
     Returns:
         pd.DataFrame: A DataFrame containing the loaded experiment data samples.
     """
-    return load_dataframes("../experiments", date, num_samples)
+    return load_dataframes("../experiments", date, num_samples, **kwargs)
+
+
+def _polars_dtype(dtype: str):
+    """Polars type of a utils.schema dtype."""
+    if dtype == TIMESTAMP:
+        return pl.Datetime("us")
+    if dtype == "category":
+        return pl.Categorical
+    return {"int8": pl.Int8, "int32": pl.Int32}[dtype]
+
+
+def scan_table(
+    name: str, root: str = "..", columns: Optional[List[str]] = None
+) -> "pl.LazyFrame":
+    """
+    Lazily scan every chunk of a table with polars.
+
+    Nothing is read until the frame is collected, so filters, projections and
+    group-bys are pushed down into the scan and can run in polars' streaming
+    engine (`.collect(engine="streaming")`). The typed Parquet mirror is
+    scanned when its parts hold every row of the manifest, otherwise the CSV
+    chunks are.
+    Columns are cast to the table's compact types (utils.schema); columns
+    without a schema entry are strings, as in the Parquet mirror.
+
+    Args:
+        name (str): Table (folder) name, e.g. "answers".
+        root (str): Directory holding the table folders.
+        columns (Optional[List[str]]): Only scan these columns.
+
+    Returns:
+        pl.LazyFrame: Lazy frame over all chunks, in chunk order.
+    """
+    if pl is None:
+        raise ImportError("scan_table requires polars (pip install polars)")
+    base_path = os.path.join(root, name)
+    csv_files = sorted(
+        (
+            f
+            for f in os.listdir(base_path)
+            if f.startswith(name + "_") and f.endswith(".csv")
+        ),
+        key=chunk_index,
+    )
+    if csv_files and mirror_covers(name, root):
+        lf = pl.scan_parquet(mirror_files(name, root))
+    else:
+        lf = pl.scan_csv(
+            [os.path.join(base_path, f) for f in csv_files], infer_schema=False
+        )
+    if columns is not None:
+        lf = lf.select(columns)
+
+    available = lf.collect_schema()
+    casts = []
+    for col, dtype in TABLE_SCHEMAS.get(name, {}).items():
+        if col not in available:
+            continue
+        if available[col] != pl.String or dtype == "category":
+            casts.append(pl.col(col).cast(_polars_dtype(dtype)))
+        elif dtype == TIMESTAMP:
+            casts.append(pl.col(col).str.to_datetime(time_unit="us", strict=False))
+        else:
+            # Integer columns with missing values are written as "0.0" / "1.0"
+            casts.append(pl.col(col).cast(pl.Float64).cast(_polars_dtype(dtype)))
+    return lf.with_columns(casts) if casts else lf
+
@@ -0,0 +1,275 @@
+"""
+# Per-table manifest describing the CSV chunks of a table folder.
+
+The manifest (`<table>/manifest.json`) is written by pull_data.py next to the
+chunks. For every chunk it records the file name, row count, min/max id,
+min/max createdAt, byte size and SHA-256 of the file, so the last id of a table
+or the date range of a chunk can be looked up without reading any CSV.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def manifest_path(folder_path: str) -> str:
+    """Path of the manifest file for a table folder."""
+    return os.path.join(folder_path, MANIFEST_FILENAME)
+
+
+def chunk_index(file_name: str) -> int:
+    """Chunk number of a file named <table>_<number>.csv."""
+    return int(file_name.split("_")[-1].split(".")[0])
+
+
+def read_manifest(folder_path: str) -> Optional[Dict]:
+    """
+    Read the manifest of a table folder.
+
+    Returns:
+        Optional[Dict]: {"files": [entry, ...]} with entries sorted by chunk
+        number, or None if the folder has no (readable) manifest.
+    """
+    path = manifest_path(folder_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8", mode="r") as f:
+            manifest = json.load(f)
+    except json.JSONDecodeError:
+        return None
+    manifest["files"] = sorted(
+        manifest.get("files", []), key=lambda e: chunk_index(e["file"])
+    )
+    return manifest
+
+
+def write_manifest(folder_path: str, manifest: Dict) -> None:
+    """Write the manifest of a table folder, replacing it atomically."""
+    path = manifest_path(folder_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, encoding="utf-8", mode="w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _hash_into(digest, path: str, block_size: int = 1 << 20, size: Optional[int] = None):
+    remaining = os.path.getsize(path) if size is None else size
+    with open(path, mode="rb") as f:
+        while remaining > 0:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest
+
+
+def hash_file(path: str, block_size: int = 1 << 20, size: Optional[int] = None) -> str:
+    """SHA-256 hex digest of a file (or of its first `size` bytes), read in blocks."""
+    return _hash_into(hashlib.sha256(), path, block_size, size).hexdigest()
+
+
+class ChunkDigests:
+    """
+    Running SHA-256 of the chunks written to during a pull.
+
+    A chunk is hashed from disk the first time it is written to, and from then
+    on only the bytes appended to it are hashed, so appending page after page
+    to the same chunk reads it once instead of once per page.
+    """
+
+    def __init__(self):
+        self._digests = {}
+
+    def appended(self, path: str, data: bytes) -> None:
+        """Record that data was just appended to the file at path."""
+        digest = self._digests.get(path)
+        if digest is None:
+            # Includes data, which is already on disk
+            self._digests[path] = _hash_into(hashlib.sha256(), path)
+        else:
+            digest.update(data)
+
+    def hexdigest(self, path: str) -> Optional[str]:
+        """SHA-256 hex digest of a file written to, or None if it was not."""
+        digest = self._digests.get(path)
+        return None if digest is None else digest.hexdigest()
+
+
+def _timestamp_str(value) -> Optional[str]:
+    return None if pd.isna(value) else str(pd.Timestamp(value))
+
+
+def _stats(df: pd.DataFrame) -> Dict:
+    """Row count and id / createdAt ranges of a frame of chunk rows."""
+    stats = {"rows": int(len(df)), "min_id": None, "max_id": None}
+    if len(df) and "id" in df.columns:
+        stats["min_id"] = int(df["id"].min())
+        stats["max_id"] = int(df["id"].max())
+    stats["min_createdAt"] = stats["max_createdAt"] = None
+    if len(df) and "createdAt" in df.columns:
+        created = pd.to_datetime(df["createdAt"], errors="coerce")
+        stats["min_createdAt"] = _timestamp_str(created.min())
+        stats["max_createdAt"] = _timestamp_str(created.max())
+    return stats
+
+
+def describe_chunk(folder_path: str, file_name: str) -> Dict:
+    """Build the manifest entry of a chunk by reading it from disk."""
+    path = os.path.join(folder_path, file_name)
+    columns = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in ("id", "createdAt") if c in columns]
+    df = pd.read_csv(path, usecols=usecols)
+    return {
+        "file": file_name,
+        **_stats(df),
+        "bytes": os.path.getsize(path),
+        "sha256": hash_file(path),
+    }
+
+
+def build_manifest(folder_path: str) -> Dict:
+    """Build the manifest of a table folder from scratch by reading every chunk."""
+    folder_name = os.path.basename(os.path.normpath(folder_path))
+    files = [
+        f
+        for f in os.listdir(folder_path)
+        if f.startswith(folder_name + "_") and f.endswith(".csv")
+    ]
+    return {
+        "files": [
+            describe_chunk(folder_path, f) for f in sorted(files, key=chunk_index)
+        ]
+    }
+
+
+def _merge_range(old, new, key):
+    values = [v for v in (old, new) if v is not None]
+    if not values:
+        return None
+    return key(values)
+
+
+def update_manifest(
+    folder_path: str,
+    written: Dict[str, pd.DataFrame],
+    digests: Optional[ChunkDigests] = None,
+) -> Dict:
+    """
+    Update the manifest of a table folder after rows were written to its chunks.
+
+    Only the chunks in `written` are touched: their stats are merged with the
+    appended rows and their size and hash are recomputed. If the folder has no
+    manifest yet, one is built from scratch from the chunks on disk.
+
+    Args:
+        folder_path (str): Table folder.
+        written (Dict[str, pd.DataFrame]): Rows appended, keyed by chunk file name.
+        digests (Optional[ChunkDigests]): Running hashes of the chunks written
+            to; chunks it does not track are re-hashed from disk.
+
+    Returns:
+        Dict: The manifest that was written.
+    """
+    manifest = read_manifest(folder_path)
+    if manifest is None:
+        manifest = build_manifest(folder_path)
+        write_manifest(folder_path, manifest)
+        return manifest
+
+    entries = {e["file"]: e for e in manifest["files"]}
+    for file_name, rows in written.items():
+        stats = _stats(rows)
+        entry = entries.get(file_name)
+        if entry is None:
+            entry = {"file": file_name, **stats}
+        else:
+            entry["rows"] += stats["rows"]
+            entry["min_id"] = _merge_range(entry["min_id"], stats["min_id"], min)
+            entry["max_id"] = _merge_range(entry["max_id"], stats["max_id"], max)
+            entry["min_createdAt"] = _merge_range(
+                entry["min_createdAt"],
+                stats["min_createdAt"],
+                lambda v: min(v, key=pd.Timestamp),
+            )
+            entry["max_createdAt"] = _merge_range(
+                entry["max_createdAt"],
+                stats["max_createdAt"],
+                lambda v: max(v, key=pd.Timestamp),
+            )
+        path = os.path.join(folder_path, file_name)
+        entry["bytes"] = os.path.getsize(path)
+        entry["sha256"] = (digests and digests.hexdigest(path)) or hash_file(path)
+        entries[file_name] = entry
+
+    manifest["files"] = sorted(entries.values(), key=lambda e: chunk_index(e["file"]))
+    write_manifest(folder_path, manifest)
+    return manifest
+
+
+def stale_files(folder_path: str, manifest: Dict, full: bool = False) -> List[str]:
+    """
+    Chunks whose manifest entry does not match the file on disk.
+
+    By default only file presence and byte sizes are compared (one stat per
+    chunk); with full=True every chunk is re-hashed as well. Chunks on disk
+    that are missing from the manifest are reported too.
+    """
+    folder_name = os.path.basename(os.path.normpath(folder_path))
+    on_disk = {
+        f
+        for f in os.listdir(folder_path)
+        if f.startswith(folder_name + "_") and f.endswith(".csv")
+    }
+    stale = sorted(on_disk - {e["file"] for e in manifest["files"]})
+    for entry in manifest["files"]:
+        path = os.path.join(folder_path, entry["file"])
+        if (
+            entry["file"] not in on_disk
+            or os.path.getsize(path) != entry["bytes"]
+            or (full and hash_file(path) != entry["sha256"])
+        ):
+            stale.append(entry["file"])
+    return stale
+
+
+def rollback_to_manifest(folder_path: str, manifest: Dict) -> List[str]:
+    """
+    Undo chunk writes that the manifest does not record.
+
+    Rows are appended to the chunks before the manifest is updated, so a pull
+    interrupted in between leaves chunks larger than their entry, or new chunks
+    after the last entry. The former are truncated back to their recorded size
+    (if that part of the file still has the recorded hash), the latter removed.
+
+    Returns:
+        List[str]: Names of the chunks that were rolled back.
+    """
+    folder_name = os.path.basename(os.path.normpath(folder_path))
+    last_index = max((chunk_index(e["file"]) for e in manifest["files"]), default=0)
+    rolled_back = []
+    for f in sorted(os.listdir(folder_path)):
+        if (
+            f.startswith(folder_name + "_")
+            and f.endswith(".csv")
+            and chunk_index(f) > last_index
+        ):
+            os.remove(os.path.join(folder_path, f))
+            rolled_back.append(f)
+    for entry in manifest["files"]:
+        path = os.path.join(folder_path, entry["file"])
+        if (
+            os.path.exists(path)
+            and os.path.getsize(path) > entry["bytes"]
+            and hash_file(path, size=entry["bytes"]) == entry["sha256"]
+        ):
+            with open(path, mode="r+b") as f:
+                f.truncate(entry["bytes"])
+            rolled_back.append(entry["file"])
+    return rolled_back
@@ -0,0 +1,200 @@
+"""
+# Typed Parquet mirror of the chunked CSV tables.
+
+Rows of every CSV chunk `<table>/<table>_N.csv` are mirrored as append-only
+part files `parquet/<table>/<table>_N.<start>-<stop>.parquet`, holding the
+chunk's rows start to stop (zero-padded). Each sync only writes a part for
+the rows appended to a chunk since the previous one, so a part is never
+rewritten once written and the mirror only grows by the new rows. Parts that
+no longer match the manifest (e.g. after a rolled back pull) or that were
+written with other column types are removed and their rows written again.
+
+Column types follow utils.schema.TABLE_SCHEMAS, except that integer columns
+are nullable (Int8, Int32) so that chunks with and without missing values get
+the same type, and categorical columns are stored as strings (Parquet
+dictionary-encodes them). Columns without a schema entry are strings.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    from .manifest import chunk_index, read_manifest
+    from .schema import TIMESTAMP, TABLE_SCHEMAS
+except ImportError:
+    from manifest import chunk_index, read_manifest
+    from schema import TIMESTAMP, TABLE_SCHEMAS
+
+MIRROR_DIR = "parquet"
+# Parquet key-value metadata recording the schema a mirror chunk was written with
+SCHEMA_METADATA_KEY = b"commonsense_data.schema"
+
+# Nullable counterparts of the schema's integer types
+NULLABLE_DTYPES = {"int8": "Int8", "int32": "Int32"}
+
+# Row offsets in part file names are zero-padded so parts sort by name
+PART_DIGITS = 9
+
+
+def mirror_folder(table: str, root: str = ".") -> str:
+    """Folder holding the Parquet mirror of a table."""
+    return os.path.join(root, MIRROR_DIR, table)
+
+
+def part_name(table: str, chunk: int, start: int, stop: int) -> str:
+    """File name of the mirror part holding rows start to stop of a chunk."""
+    return f"{table}_{chunk}.{start:0{PART_DIGITS}d}-{stop:0{PART_DIGITS}d}.parquet"
+
+
+def _parse_part(table: str, filename: str) -> Optional[Tuple[int, int, int]]:
+    """(chunk, start, stop) of a mirror part file name, or None for other files."""
+    match = re.fullmatch(re.escape(table) + r"_(\d+)\.(\d+)-(\d+)\.parquet", filename)
+    return tuple(int(group) for group in match.groups()) if match else None
+
+
+def _mirror_parts(table: str, root: str = ".") -> Dict[str, Tuple[int, int, int]]:
+    folder_path = mirror_folder(table, root)
+    if not os.path.exists(folder_path):
+        return {}
+    parts = {f: _parse_part(table, f) for f in os.listdir(folder_path)}
+    return {f: part for f, part in parts.items() if part is not None}
+
+
+def mirror_files(table: str, root: str = ".") -> List[str]:
+    """Paths of the mirror parts of a table, in row order."""
+    parts = _mirror_parts(table, root)
+    folder_path = mirror_folder(table, root)
+    return [os.path.join(folder_path, f) for f in sorted(parts, key=parts.get)]
+
+
+def mirror_covers(table: str, root: str = ".") -> bool:
+    """Whether the mirror parts of a table hold exactly the rows of its manifest."""
+    manifest = read_manifest(os.path.join(root, table))
+    if manifest is None:
+        return False
+    covered = {}
+    for chunk, start, stop in sorted(_mirror_parts(table, root).values()):
+        if covered.get(chunk, 0) != start:
+            return False
+        covered[chunk] = stop
+    return covered == {
+        chunk_index(entry["file"]): entry["rows"] for entry in manifest["files"] if entry["rows"]
+    }
+
+
+def _schema_fingerprint(table: str) -> bytes:
+    return json.dumps(TABLE_SCHEMAS.get(table, {}), sort_keys=True).encode()
+
+
+def apply_mirror_dtypes(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """Cast a frame of raw table rows to the mirror's column types for the table."""
+    schema = TABLE_SCHEMAS.get(table, {})
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        dtype = schema.get(col)
+        if dtype == TIMESTAMP:
+            # Naive UTC, as utils.schema.apply_schema
+            out[col] = pd.to_datetime(
+                values, errors="coerce", format="ISO8601", utc=True
+            ).dt.tz_convert(None)
+        elif dtype in NULLABLE_DTYPES:
+            out[col] = pd.to_numeric(values, errors="coerce").astype(NULLABLE_DTYPES[dtype])
+        else:
+            out[col] = values.astype("string")
+    return pd.DataFrame(out, index=df.index)
+
+
+def _write_mirror_part(
+    table: str, csv_path: str, start: int, stop: int, parquet_path: str
+) -> None:
+    # Parse every column as text first so no chunk-dependent type inference
+    # leaks into the mirror's schema
+    raw = pd.read_csv(csv_path, dtype=str, keep_default_na=False, na_values=[""])
+    rows = apply_mirror_dtypes(raw.iloc[start:stop], table)
+    arrow_table = pa.Table.from_pandas(rows, preserve_index=False)
+    metadata = {
+        **(arrow_table.schema.metadata or {}),
+        SCHEMA_METADATA_KEY: _schema_fingerprint(table),
+    }
+    tmp_path = parquet_path + ".tmp"
+    pq.write_table(arrow_table.replace_schema_metadata(metadata), tmp_path, compression="zstd")
+    os.replace(tmp_path, parquet_path)
+
+
+def _is_current(parquet_path: str, rows: int, fingerprint: bytes) -> bool:
+    """Whether a mirror part has the given row count and column types."""
+    metadata = pq.read_metadata(parquet_path)
+    return (
+        metadata.num_rows == rows
+        and (metadata.metadata or {}).get(SCHEMA_METADATA_KEY) == fingerprint
+    )
+
+
+def sync_parquet_mirror(table: str, root: str = ".") -> Optional[Dict[str, int]]:
+    """
+    Bring the Parquet mirror of a table in line with its CSV chunks.
+
+    For every chunk in the manifest, the leading parts that are consistent
+    with it (contiguous from row 0, within its row count, with the current
+    column types) are kept, and the remaining rows of the chunk are written
+    to a new part. Every other file in the mirror folder (outdated parts,
+    parts of chunks no longer in the manifest, leftover temporary files) is
+    removed. Chunks whose parts are all kept are not read.
+
+    Returns:
+        Optional[Dict[str, int]]: Rows written per new mirror part, or None if
+        the mirror cannot be maintained (no pyarrow, or no manifest).
+    """
+    if pq is None:
+        print("pyarrow is not installed; skipping Parquet mirror")
+        return None
+    manifest = read_manifest(os.path.join(root, table))
+    if manifest is None:
+        return None
+
+    folder_path = mirror_folder(table, root)
+    os.makedirs(folder_path, exist_ok=True)
+    fingerprint = _schema_fingerprint(table)
+    parts_by_chunk = {}
+    for filename, (chunk, start, stop) in _mirror_parts(table, root).items():
+        parts_by_chunk.setdefault(chunk, []).append((start, stop, filename))
+
+    kept = set()
+    written = {}
+    for entry in manifest["files"]:
+        chunk = chunk_index(entry["file"])
+        covered = 0
+        for start, stop, filename in sorted(parts_by_chunk.get(chunk, [])):
+            if start != covered or stop > entry["rows"]:
+                break
+            if not _is_current(os.path.join(folder_path, filename), stop - start, fingerprint):
+                break
+            kept.add(filename)
+            covered = stop
+        if covered < entry["rows"]:
+            filename = part_name(table, chunk, covered, entry["rows"])
+            _write_mirror_part(
+                table,
+                os.path.join(root, table, entry["file"]),
+                covered,
+                entry["rows"],
+                os.path.join(folder_path, filename),
+            )
+            kept.add(filename)
+            written[filename] = entry["rows"] - covered
+
+    for filename in os.listdir(folder_path):
+        if filename not in kept:
+            os.remove(os.path.join(folder_path, filename))
+    return written
@@ -0,0 +1,100 @@
+"""
+# Compact column types of the tables, applied by every loader right after parsing.
+
+Session ids and other repeated labels are categorical, ids are int32, 0/1
+ratings are int8 and timestamps are datetime64. Integer columns that hold
+missing values stay float64 with NaN, as pandas parses them, so comparisons
+and means behave as before.
+
+Categorical columns keep every category after filtering, so group-bys on them
+must pass observed=True.
+"""
+
+from typing import Dict
+
+import pandas as pd
+
+TIMESTAMP = "datetime64[ns]"
+
+# Raw tables pulled by pull_data.py, keyed by table (folder) name
+TABLE_SCHEMAS: Dict[str, Dict[str, str]] = {
+    "answers": {
+        "id": "int32",
+        "statementId": "int32",
+        "sessionId": "category",
+        "I_agree": "int8",
+        "others_agree": "int8",
+        "createdAt": TIMESTAMP,
+        "updatedAt": TIMESTAMP,
+    },
+    "individuals": {
+        "id": "int32",
+        "sessionId": "category",
+        "informationType": "category",
+        "createdAt": TIMESTAMP,
+        "updatedAt": TIMESTAMP,
+    },
+    "experiments": {
+        "id": "int32",
+        "sessionId": "category",
+        "createdAt": TIMESTAMP,
+        "updatedAt": TIMESTAMP,
+    },
+    "statements": {
+        "id": "int32",
+        "createdAt": TIMESTAMP,
+        "updatedAt": TIMESTAMP,
+    },
+    "statementproperties": {
+        "id": "int32",
+        "statementId": "int32",
+        "name": "category",
+        "available": "int8",
+        "createdAt": TIMESTAMP,
+        "updatedAt": TIMESTAMP,
+    },
+}
+
+# Files generated by visualize/update-data.py, keyed by file name
+DATA_SCHEMAS: Dict[str, Dict[str, str]] = {
+    "answers.csv": {
+        "sessionId": "category",
+        "statementId": "int32",
+        "I_agree": "int8",
+        "others_agree": "int8",
+        "createdAt": TIMESTAMP,
+    },
+    "crt_rme_demo.csv": {
+        "country_reside": "category",
+    },
+}
+
+
+def apply_schema(df: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """
+    Cast the columns of a frame to their compact types, in place.
+
+    Args:
+        df (pd.DataFrame): Frame to convert; columns missing from it are skipped.
+        schema (Dict[str, str]): Column name -> dtype, e.g. TABLE_SCHEMAS["answers"].
+
+    Returns:
+        pd.DataFrame: The same frame, for chaining.
+    """
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if dtype == TIMESTAMP:
+            if not pd.api.types.is_datetime64_any_dtype(values):
+                values = pd.to_datetime(values, format="ISO8601")
+            if values.dt.tz is not None:
+                values = values.dt.tz_convert(None)
+            df[col] = values.astype(TIMESTAMP)
+        elif dtype == "category":
+            df[col] = values.astype("category")
+        elif values.isna().any():
+            df[col] = values.astype("float64")
+        else:
+            df[col] = values.astype(dtype)
+    return df
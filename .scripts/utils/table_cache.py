@@ -0,0 +1,130 @@
+"""
+# Local on-disk cache of parsed, typed table chunks.
+
+Each CSV chunk `<table>/<table>_N.csv` is cached as a pickle of its typed
+DataFrame in `.cache/<table>/<table>_N.pkl` (next to the table folders, or
+under LOAD_DATA_CACHE_DIR). An index records the size and mtime of every
+chunk when it was cached, so only chunks that are new or changed on disk
+(e.g. the last chunk after pull_data.py appended to it) are parsed again.
+"""
+
+import json
+import os
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+try:
+    from .schema import TABLE_SCHEMAS, apply_schema
+except ImportError:
+    from schema import TABLE_SCHEMAS, apply_schema
+
+CACHE_DIR = ".cache"
+INDEX_FILENAME = "index.json"
+# Bump to invalidate every cache written by an older layout
+CACHE_VERSION = 1
+
+
+def cache_folder(base_path: str) -> str:
+    """Cache folder of a table folder."""
+    base_path = os.path.normpath(base_path)
+    root = os.environ.get(
+        "LOAD_DATA_CACHE_DIR", os.path.join(os.path.dirname(base_path), CACHE_DIR)
+    )
+    return os.path.join(root, os.path.basename(base_path))
+
+
+def _file_key(path: str) -> Dict:
+    stat = os.stat(path)
+    return {"bytes": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _schema_key(table: str) -> str:
+    return json.dumps(
+        {"version": CACHE_VERSION, "schema": TABLE_SCHEMAS.get(table, {})},
+        sort_keys=True,
+    )
+
+
+def read_index(folder_path: str, table: str) -> Dict[str, Dict]:
+    """
+    Read the cache index of a table.
+
+    Returns:
+        Dict[str, Dict]: Cached chunk file name -> {"bytes", "mtime_ns"}. Empty if
+        there is no index or it was written for another schema or cache version.
+    """
+    path = os.path.join(folder_path, INDEX_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8", mode="r") as f:
+            index = json.load(f)
+    except json.JSONDecodeError:
+        return {}
+    if index.get("schema") != _schema_key(table):
+        return {}
+    return index.get("files", {})
+
+
+def write_index(folder_path: str, table: str, files: Dict[str, Dict]) -> None:
+    """Write the cache index of a table, replacing it atomically."""
+    path = os.path.join(folder_path, INDEX_FILENAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, encoding="utf-8", mode="w") as f:
+        json.dump({"schema": _schema_key(table), "files": files}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _pickle_path(folder_path: str, file_name: str) -> str:
+    return os.path.join(folder_path, file_name[: -len(".csv")] + ".pkl")
+
+
+def iter_cached_chunks(
+    files: List[str], read_chunks, workers: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the typed DataFrames of CSV chunks in order, from the cache when fresh.
+
+    Chunks missing from the cache, or whose size or mtime changed since they
+    were cached, are parsed with `read_chunks`, typed with the table's schema
+    and written to the cache before being yielded.
+
+    Args:
+        files (List[str]): Paths of the CSV chunks of a single table folder.
+        read_chunks (Callable): Function (files, workers) -> iterator of raw
+            DataFrames in file order, e.g. load_data.iter_csv_chunks.
+        workers (Optional[int]): Number of stale chunks parsed concurrently.
+    """
+    if not files:
+        return
+    base_path = os.path.dirname(files[0])
+    table = os.path.basename(os.path.normpath(base_path))
+    schema = TABLE_SCHEMAS.get(table, {})
+    folder_path = cache_folder(base_path)
+    os.makedirs(folder_path, exist_ok=True)
+
+    index = read_index(folder_path, table)
+    keys = {f: _file_key(f) for f in files}
+    stale = [
+        f
+        for f in files
+        if index.get(os.path.basename(f)) != keys[f]
+        or not os.path.exists(_pickle_path(folder_path, os.path.basename(f)))
+    ]
+    parsed = read_chunks(stale, workers)
+    stale = set(stale)
+
+    for f in files:
+        file_name = os.path.basename(f)
+        pickle_path = _pickle_path(folder_path, file_name)
+        if f not in stale:
+            yield pd.read_pickle(pickle_path)
+            continue
+        df = apply_schema(next(parsed), schema)
+        tmp_path = pickle_path + ".tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, pickle_path)
+        index[file_name] = keys[f]
+        write_index(folder_path, table, index)
+        yield df
@@ -0,0 +1,175 @@
+"""
+Vectorized bootstrap confidence intervals of per-group statistics.
+
+Instead of a Python loop over resamples, all resamples of a group are drawn
+at once, either as a (rows x n_boots) matrix of indices into the group's rows
+("index", the classic multinomial bootstrap) or as Poisson(1) weights of its
+rows ("poisson"). Per-group sums of the resampled columns are then taken for
+every resample in one np.add.reduceat. Groups are processed in chunks of whole
+groups of at most max_cells rows x resamples, which caps memory. Random numbers
+are drawn row by row in group order, so a seed gives the same output whatever
+the chunk size.
+"""
+
+import warnings
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("index", "poisson")
+# Rows x resamples per chunk (each array of a chunk is 8 bytes per cell)
+DEFAULT_MAX_CELLS = 1 << 22
+
+
+def _chunks(sizes: np.ndarray, n_boots: int, max_cells: int) -> Iterator[Tuple[int, int]]:
+    """[start, stop) group ranges of at most max_cells rows x n_boots (at least one group)."""
+    max_rows = max(1, max_cells // n_boots)
+    start, rows = 0, 0
+    for group, size in enumerate(sizes):
+        if rows and rows + size > max_rows:
+            yield start, group
+            start, rows = group, 0
+        rows += size
+    if rows:
+        yield start, len(sizes)
+
+
+def _resampled_sums(
+    columns: Dict[str, np.ndarray],
+    sizes: np.ndarray,
+    n_boots: int,
+    method: str,
+    rng: np.random.Generator,
+    max_cells: int,
+) -> Iterator[Tuple[int, int, Dict[str, np.ndarray]]]:
+    """
+    Yield (first group, stop group, sums) per chunk of groups.
+
+    columns hold the rows sorted by group, sizes the number of rows of every
+    group. sums maps every column, and "n" (the resample size), to an array of
+    shape (groups in the chunk, n_boots).
+    """
+    if not len(sizes):
+        yield 0, 0, {name: np.empty((0, n_boots)) for name in [*columns, "n"]}
+        return
+    starts = np.concatenate([[0], np.cumsum(sizes)])
+    for g0, g1 in _chunks(sizes, n_boots, max_cells):
+        r0, r1 = starts[g0], starts[g1]
+        local_starts = starts[g0:g1] - r0
+        if method == "index":
+            # A random row of the same group for every (row, resample)
+            row_size = np.repeat(sizes[g0:g1], sizes[g0:g1])[:, None]
+            row_start = np.repeat(local_starts, sizes[g0:g1])[:, None]
+            picks = row_start + (rng.random((r1 - r0, n_boots)) * row_size).astype(np.int64)
+            sums = {
+                name: np.add.reduceat(values[r0:r1][picks], local_starts, axis=0)
+                for name, values in columns.items()
+            }
+            sums["n"] = np.broadcast_to(sizes[g0:g1, None].astype(float), (g1 - g0, n_boots))
+        else:
+            weights = rng.poisson(1.0, (r1 - r0, n_boots)).astype(float)
+            sums = {
+                name: np.add.reduceat(values[r0:r1, None] * weights, local_starts, axis=0)
+                for name, values in columns.items()
+            }
+            sums["n"] = np.add.reduceat(weights, local_starts, axis=0)
+        yield g0, g1, sums
+
+
+def _check(n_boots: int, method: str) -> None:
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, not '{method}'")
+    if n_boots < 1:
+        raise ValueError("n_boots must be at least 1")
+
+
+def group_bootstrap_ci(
+    columns: Dict[str, np.ndarray],
+    groups,
+    statistic: Callable[[Dict[str, np.ndarray]], Dict[str, np.ndarray]],
+    n_boots: int = 1000,
+    ci: float = 0.95,
+    method: str = "index",
+    seed: Optional[int] = 0,
+    max_cells: int = DEFAULT_MAX_CELLS,
+) -> pd.DataFrame:
+    """
+    Percentile bootstrap confidence intervals of statistics of every group's rows.
+
+    Args:
+        columns (Dict[str, np.ndarray]): Numeric columns of the rows, all of the
+            same length. NaN values propagate into the sums, so encode missing
+            values with an extra indicator column instead.
+        groups (array-like): Group of every row, e.g. sessionId or statementId.
+            Rows with a missing group are ignored.
+        statistic (Callable): Function of the resampled sums, a dict mapping
+            every column and "n" (the number of rows drawn) to an array of shape
+            (groups, resamples), returning a dict of statistic name -> array of
+            the same shape. E.g. lambda s: {"mean": s["x"] / s["n"]}.
+        n_boots (int): Number of resamples per group.
+        ci (float): Confidence level of the intervals.
+        method (str): "index" to resample each group's rows with replacement,
+            or "poisson" to weight them with Poisson(1) counts (the resample
+            size then varies; slower to draw than indices with numpy).
+        seed (Optional[int]): Seed of the random generator.
+        max_cells (int): Upper bound on rows x resamples held at once.
+
+    Returns:
+        pd.DataFrame: Indexed by the sorted groups, with columns
+        "<name>_ci_low" and "<name>_ci_high" for every statistic. Resamples
+        where a statistic is NaN (e.g. an empty Poisson resample) are ignored.
+    """
+    _check(n_boots, method)
+    codes, uniques = pd.factorize(groups, sort=True)
+    kept = np.flatnonzero(codes >= 0)
+    order = kept[np.argsort(codes[kept], kind="stable")]
+    sizes = np.bincount(codes[kept], minlength=len(uniques))
+    sorted_columns = {
+        name: np.asarray(values, dtype=float)[order] for name, values in columns.items()
+    }
+
+    alpha = (1 - ci) / 2
+    rng = np.random.default_rng(seed)
+    bounds = {}
+    for g0, g1, sums in _resampled_sums(sorted_columns, sizes, n_boots, method, rng, max_cells):
+        with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+            # All-NaN groups (e.g. no scored statistic) give a NaN interval
+            warnings.simplefilter("ignore", RuntimeWarning)
+            for name, values in statistic(sums).items():
+                quantiles = np.nanquantile(values, [alpha, 1 - alpha], axis=1)
+                low, high = quantiles.reshape(2, len(values))
+                bounds.setdefault(f"{name}_ci_low", []).append(low)
+                bounds.setdefault(f"{name}_ci_high", []).append(high)
+    return pd.DataFrame(
+        {name: np.concatenate(parts) for name, parts in bounds.items()},
+        index=pd.Index(uniques),
+    )
+
+
+def bootstrap_mean_difference(
+    a,
+    b,
+    n_boots: int = 1000,
+    method: str = "index",
+    seed: Optional[int] = 0,
+    max_cells: int = DEFAULT_MAX_CELLS,
+) -> np.ndarray:
+    """
+    Bootstrap distribution of mean(a) - mean(b), resampling a and b independently.
+
+    Returns:
+        np.ndarray: n_boots differences of the resampled means, e.g. to plot or
+        to take percentiles of.
+    """
+    _check(n_boots, method)
+    values = np.concatenate([np.asarray(a, dtype=float), np.asarray(b, dtype=float)])
+    sizes = np.array([len(a), len(b)])
+    if not sizes.all():
+        raise ValueError("a and b must not be empty")
+    rng = np.random.default_rng(seed)
+    means = np.empty((2, n_boots))
+    for g0, g1, sums in _resampled_sums({"x": values}, sizes, n_boots, method, rng, max_cells):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means[g0:g1] = sums["x"] / sums["n"]
+    return means[0] - means[1]
@@ -0,0 +1,134 @@
+"""
+Bounded, thread-safe cache of encoded API responses shared by all endpoints.
+
+Values are encoded responses (bytes) or arrays the responses are computed
+from (anything with an `nbytes`, e.g. numpy arrays), sized accordingly.
+Entries are evicted least-recently-used first once the total size of the
+cached responses exceeds a byte budget. Concurrent misses on the same key are
+computed once (single flight): later requests wait for the first one's result.
+Hits, misses, coalesced waits and evictions are counted per endpoint.
+"""
+
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Hashable, Optional
+
+# Rough per-entry bookkeeping cost (key tuple, OrderedDict node) added to the
+# size of the cached value
+ENTRY_OVERHEAD = 256
+
+
+class _Flight:
+    """A computation in progress that other requests for the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._bytes = 0
+        self._in_flight: "dict[tuple, _Flight]" = {}
+        self._lock = threading.Lock()
+        self._stats = defaultdict(
+            lambda: {
+                "hits": 0,
+                "misses": 0,
+                "coalesced": 0,
+                "evictions": 0,
+                "entries": 0,
+                "bytes": 0,
+            }
+        )
+
+    @staticmethod
+    def _size(value: Any) -> int:
+        size = value.nbytes if hasattr(value, "nbytes") else len(value)
+        return size + ENTRY_OVERHEAD
+
+    def get(self, endpoint: str, key: Hashable) -> Optional[Any]:
+        """Cached response for (endpoint, key), or None; counts a hit or a miss."""
+        with self._lock:
+            value = self._entries.get((endpoint, key))
+            if value is None:
+                self._stats[endpoint]["misses"] += 1
+                return None
+            self._entries.move_to_end((endpoint, key))
+            self._stats[endpoint]["hits"] += 1
+            return value
+
+    def get_or_compute(
+        self, endpoint: str, key: Hashable, compute: Callable[[], Any]
+    ) -> Any:
+        """
+        Cached response for (endpoint, key), computing and caching it on a miss.
+
+        If another thread is already computing the same key, wait for its result
+        (or its exception) instead of computing it a second time.
+        """
+        with self._lock:
+            value = self._entries.get((endpoint, key))
+            if value is not None:
+                self._entries.move_to_end((endpoint, key))
+                self._stats[endpoint]["hits"] += 1
+                return value
+            flight = self._in_flight.get((endpoint, key))
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[(endpoint, key)] = _Flight()
+                self._stats[endpoint]["misses"] += 1
+            else:
+                self._stats[endpoint]["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            self.put(endpoint, key, flight.value)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[(endpoint, key)]
+            flight.done.set()
+
+    def put(self, endpoint: str, key: Hashable, value: Any) -> None:
+        """Cache a response, evicting least recently used entries to stay in budget."""
+        size = self._size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop((endpoint, key), None)
+            if old is not None:
+                self._account(endpoint, -1, -self._size(old))
+            self._entries[(endpoint, key)] = value
+            self._account(endpoint, 1, size)
+            while self._bytes > self.max_bytes:
+                (old_endpoint, _), old = self._entries.popitem(last=False)
+                self._account(old_endpoint, -1, -self._size(old))
+                self._stats[old_endpoint]["evictions"] += 1
+
+    def _account(self, endpoint: str, entries: int, size: int) -> None:
+        self._bytes += size
+        self._stats[endpoint]["entries"] += entries
+        self._stats[endpoint]["bytes"] += size
+
+    def stats(self) -> dict:
+        """Budget, total size and per-endpoint counters, JSON-serialisable."""
+        with self._lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "bytes": self._bytes,
+                "entries": len(self._entries),
+                "endpoints": {name: dict(s) for name, s in sorted(self._stats.items())},
+            }
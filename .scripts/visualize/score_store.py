@@ -0,0 +1,302 @@
+"""
+Incrementally maintained sufficient statistics of the commonsensicality scores.
+
+The store keeps, for the scored answers (the latest answer of every scored
+session to every statement, see latest_answers):
+  - per statement, globally and per country: the number of answers and of
+    I_agree ratings, the sum of I_agree and the number and sum of non-missing
+    others_agree;
+  - per session: over its answers to statements with enough answers, the
+    number of answers and how many of its I_agree / others_agree match the
+    statement's majority vote (the tallies behind individual_commonsensicality
+    with all answers as target and reference).
+
+It does not keep the answers themselves, only the last answer id it has seen
+and the country of every scored session. update() is given all answer rows
+but only reads those of sessions with answers newer than that id, or that
+joined, left or changed country. When a statement's majority vote flips, or
+it crosses min_ratings_per_statement, only the sessions that answered it are
+re-tallied for it. verify() compares the store with a full recompute.
+update-data.py keeps the store in data/score_store.pkl.
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils import (
+    individual_commonsensicality,
+    statement_commonsensicality,
+    statement_commonsensicality_by_group,
+    statement_commonsensicality_from_stats,
+)
+
+# Bump to discard stores written by an older layout
+STORE_VERSION = 2
+STORE_FILENAME = "score_store.pkl"
+
+KEY_COLS = ["sessionId", "statementId"]
+ROW_COLS = ["id"] + KEY_COLS + ["I_agree", "others_agree", "createdAt"]
+STAT_COLS = ["n_answers", "n_ratings", "I_agree_sum", "others_agree_n", "others_agree_sum"]
+TALLY_COLS = ["n_scoring", "I_agree_matches", "others_agree_matches"]
+
+
+def latest_answers(rows: pd.DataFrame) -> pd.DataFrame:
+    """Latest answer (by createdAt, then by position) of every session to every statement."""
+    return rows.sort_values("createdAt", kind="stable").drop_duplicates(KEY_COLS, keep="last")
+
+
+def _stats(rows: pd.DataFrame, keys: list) -> pd.DataFrame:
+    """STAT_COLS of rows grouped by keys (rows with a missing key are skipped)."""
+    I_agree = rows["I_agree"].astype(float)
+    others = rows["others_agree"].astype(float)
+    return (
+        pd.DataFrame(
+            {
+                **{key: rows[key].to_numpy() for key in keys},
+                "n_answers": 1,
+                "n_ratings": I_agree.notna().to_numpy(dtype=int),
+                "I_agree_sum": I_agree.fillna(0).to_numpy(),
+                "others_agree_n": others.notna().to_numpy(dtype=int),
+                "others_agree_sum": others.fillna(0).to_numpy(),
+            }
+        )
+        .groupby(keys)
+        .sum()
+    )
+
+
+def _add_stats(
+    stats: pd.DataFrame, added: pd.DataFrame, removed: pd.DataFrame
+) -> pd.DataFrame:
+    stats = stats.add(added, fill_value=0).sub(removed, fill_value=0)
+    return stats[stats["n_answers"] > 0]
+
+
+class ScoreStore:
+    def __init__(self, min_ratings_per_statement: int = 10, min_statements_per_user: int = 5):
+        self.min_ratings_per_statement = min_ratings_per_statement
+        self.min_statements_per_user = min_statements_per_user
+        self.last_id = 0
+        self.countries = pd.Series(index=pd.Index([], name="sessionId"), dtype=object)
+        empty = pd.DataFrame(columns=ROW_COLS + ["country_reside"])
+        self.global_stats = _stats(empty, ["statementId"])
+        self.country_stats = _stats(empty, ["country_reside", "statementId"])
+        self.tallies = pd.DataFrame(
+            columns=TALLY_COLS, index=pd.Index([], name="sessionId"), dtype=np.int64
+        )
+
+    # ── Persistence ───────────────────────────────────────────────────────
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "ScoreStore":
+        """Store saved at path, or an empty store if there is none (or it is outdated)."""
+        store = cls(**kwargs)
+        if not os.path.exists(path):
+            return store
+        state = pd.read_pickle(path)
+        if state.get("version") != STORE_VERSION or state["params"] != (
+            store.min_ratings_per_statement,
+            store.min_statements_per_user,
+        ):
+            return store
+        store.last_id = state["last_id"]
+        store.countries = state["countries"]
+        store.global_stats = state["global_stats"]
+        store.country_stats = state["country_stats"]
+        store.tallies = state["tallies"]
+        return store
+
+    def save(self, path: str) -> None:
+        """Write the store to path, replacing it atomically."""
+        state = {
+            "version": STORE_VERSION,
+            "params": (self.min_ratings_per_statement, self.min_statements_per_user),
+            "last_id": self.last_id,
+            "countries": self.countries,
+            "global_stats": self.global_stats,
+            "country_stats": self.country_stats,
+            "tallies": self.tallies,
+        }
+        tmp_path = path + ".tmp"
+        pd.to_pickle(state, tmp_path)
+        os.replace(tmp_path, path)
+
+    # ── Updates ───────────────────────────────────────────────────────────
+    def update(self, answers: pd.DataFrame, countries: pd.Series) -> pd.Index:
+        """
+        Bring the store up to date with the current answers.
+
+        Answer rows are expected to only be appended, with increasing ids. The
+        latest answers of the sessions with an answer newer than last_id, and
+        of the sessions that joined, left or changed country, replace their
+        previous latest answers (those with an id up to last_id); no other
+        session is read unless a statement it answered changes its vote.
+
+        Args:
+            answers (pd.DataFrame): Every answer row, not only the latest ones,
+                with columns ROW_COLS.
+            countries (pd.Series): country_reside of every scored session,
+                indexed by sessionId. Answers of other sessions are ignored.
+
+        Returns:
+            pd.Index: statementIds whose majority vote or eligibility changed,
+            and whose answers were therefore re-tallied.
+        """
+        ids = answers["id"].to_numpy()
+        last_id = int(ids.max(initial=0))
+        if last_id < self.last_id:
+            # The answers were rewritten: start over
+            self.__init__(self.min_ratings_per_statement, self.min_statements_per_user)
+        countries = countries.astype(object).rename(index=str)
+
+        old = self.countries
+        common = old.index.intersection(countries.index)
+        moved = common[(old[common].fillna("") != countries[common].fillna("")).to_numpy()]
+        with_new = pd.Index(answers["sessionId"][ids > self.last_id].astype(str).unique())
+        removed_sessions = old.index.difference(countries.index).union(
+            moved.union(with_new.intersection(old.index))
+        )
+        added_sessions = countries.index.difference(old.index).union(
+            moved.union(with_new.intersection(countries.index))
+        )
+
+        rows = answers[answers["sessionId"].isin(removed_sessions.union(added_sessions))]
+        rows = rows.assign(sessionId=rows["sessionId"].astype(str))
+        removed = latest_answers(
+            rows[(rows["id"] <= self.last_id) & rows["sessionId"].isin(removed_sessions)]
+        )
+        removed = removed.assign(country_reside=removed["sessionId"].map(old))
+        added = latest_answers(rows[rows["sessionId"].isin(added_sessions)])
+        added = added.assign(country_reside=added["sessionId"].map(countries))
+
+        # Statement statistics are sums, so deltas are added and subtracted
+        old_vote = self._votes()
+        keys = ["statementId"]
+        self.global_stats = _add_stats(
+            self.global_stats, _stats(added, keys), _stats(removed, keys)
+        )
+        keys = ["country_reside", "statementId"]
+        self.country_stats = _add_stats(
+            self.country_stats, _stats(added, keys), _stats(removed, keys)
+        )
+        new_vote = self._votes()
+        voted = old_vote.index.union(new_vote.index)
+        changed = voted[
+            old_vote.reindex(voted, fill_value=-1).to_numpy()
+            != new_vote.reindex(voted, fill_value=-1).to_numpy()
+        ]
+
+        # Replaced answers leave the tallies with the vote they were tallied with
+        deltas = [-self._tally(removed, old_vote), self._tally(added, new_vote)]
+        if len(changed):
+            # Other sessions only move the answers of changed statements to the new vote
+            rest = answers[answers["statementId"].isin(changed)]
+            rest = rest[
+                rest["sessionId"].isin(countries.index)
+                & ~rest["sessionId"].isin(added_sessions)
+            ]
+            rest = latest_answers(rest.assign(sessionId=rest["sessionId"].astype(str)))
+            deltas += [-self._tally(rest, old_vote), self._tally(rest, new_vote)]
+        self._add_tally(pd.concat(deltas).groupby(level=0).sum())
+
+        self.countries = countries
+        self.last_id = last_id
+        return changed
+
+    def _votes(self) -> pd.Series:
+        """Majority vote (0/1) of every statement with enough answers, indexed by statementId."""
+        stats = self.global_stats[
+            self.global_stats["n_answers"] >= self.min_ratings_per_statement
+        ]
+        # A statement without any I_agree votes 0, as in individual_commonsensicality
+        return (stats["I_agree_sum"] / stats["n_ratings"] >= 0.5).astype(int)
+
+    @staticmethod
+    def _tally(rows: pd.DataFrame, votes: pd.Series) -> pd.DataFrame:
+        """TALLY_COLS per session of the rows on statements with a vote."""
+        vote = votes.reindex(rows["statementId"].to_numpy()).to_numpy(dtype=float)
+        counted = ~np.isnan(vote)
+        rows, vote = rows[counted], vote[counted]
+        return (
+            pd.DataFrame(
+                {
+                    "sessionId": rows["sessionId"].to_numpy(),
+                    "n_scoring": 1,
+                    "I_agree_matches": (
+                        rows["I_agree"].to_numpy(dtype=float) == vote
+                    ).astype(int),
+                    "others_agree_matches": (
+                        rows["others_agree"].to_numpy(dtype=float) == vote
+                    ).astype(int),
+                }
+            )
+            .groupby("sessionId")
+            .sum()
+        )
+
+    def _add_tally(self, delta: pd.DataFrame) -> None:
+        if delta.empty:
+            return
+        tallies = self.tallies.add(delta, fill_value=0).astype(np.int64)
+        self.tallies = tallies[tallies["n_scoring"] > 0]
+
+    # ── Scores ────────────────────────────────────────────────────────────
+    def statement_scores(self, country: Optional[str] = None) -> pd.DataFrame:
+        """Same as utils.statement_commonsensicality(answers of the country, or all answers)."""
+        if country is None:
+            stats = self.global_stats
+        elif country in self.country_stats.index.get_level_values("country_reside"):
+            stats = self.country_stats.xs(country, level="country_reside")
+        else:
+            stats = self.global_stats.iloc[:0]
+        # The threshold counts answers, including those without an I_agree
+        stats = stats[stats["n_answers"] >= self.min_ratings_per_statement]
+        return statement_commonsensicality_from_stats(stats, min_ratings_per_statement=0)
+
+    def individual_scores(self) -> pd.DataFrame:
+        """Same as utils.individual_commonsensicality(answers, answers) for the stored answers."""
+        tallies = self.tallies[self.tallies["n_scoring"] >= self.min_statements_per_user]
+        tallies = tallies.sort_index()
+        consensus = tallies["I_agree_matches"] / tallies["n_scoring"]
+        awareness = tallies["others_agree_matches"] / tallies["n_scoring"]
+        return pd.DataFrame(
+            {
+                "consensus": consensus,
+                "awareness": awareness,
+                "commonsensicality": np.sqrt(consensus * awareness),
+            }
+        )
+
+    def verify(self, ratings: pd.DataFrame) -> bool:
+        """
+        Whether the store's scores equal a full recompute from the ratings.
+
+        Args:
+            ratings (pd.DataFrame): The latest answers of the scored sessions,
+                with a country_reside column.
+        """
+        individual = individual_commonsensicality(
+            ratings,
+            ratings,
+            self.min_ratings_per_statement,
+            self.min_statements_per_user,
+            engine="numpy",
+        )
+        individual = individual.set_axis(individual.index.astype(str))
+        if not self.individual_scores().equals(individual):
+            return False
+        if not self.statement_scores().equals(
+            statement_commonsensicality(ratings, self.min_ratings_per_statement)
+        ):
+            return False
+        by_country = statement_commonsensicality_by_group(
+            ratings, "country_reside", self.min_ratings_per_statement
+        )
+        return all(
+            self.statement_scores(country).equals(
+                by_country.xs(country, level="country_reside")
+            )
+            for country in by_country.index.unique("country_reside")
+        )
@@ -5,21 +5,41 @@ Usage:  python3 server.py [port]
 Then open http://localhost:8080
 """
 
+import functools
+import gzip
+import hashlib
 import http.server
-import itertools
+import inspect
 import json
 import os
 import sys
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 PORT = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
+# Requests handled concurrently; further connections wait in the pool's queue
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", "8"))
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
-from utils import individual_commonsensicality, statement_commonsensicality
+# Shared table schemas live in .scripts/utils; the Docker image vendors them
+# next to this file instead
+sys.path.insert(1, os.path.join(BASE_DIR, "..", "utils"))
+from utils import (
+    individual_commonsensicality,
+    statement_commonsensicality_from_stats,
+)
+from json_payload import ENCODER, dumps, frame_records
+from response_cache import ResponseCache
+from schema import DATA_SCHEMAS, apply_schema
 
 DATA_DIR = os.environ.get("DATA_DIR", os.path.join(BASE_DIR, "data"))
 # Default to the in-repo location for local dev; override with STATEMENTS_PATH
@@ -31,10 +51,13 @@ STATEMENTS_PATH = os.environ.get(
 
 # ── Load data once at startup ──────────────────────────────────────────────
 print("Loading data…")
-answers = pd.read_csv(os.path.join(DATA_DIR, "answers.csv"))
-if "createdAt" in answers.columns:
-    answers["createdAt"] = pd.to_datetime(answers["createdAt"], utc=False)
-demo = pd.read_csv(os.path.join(DATA_DIR, "crt_rme_demo.csv"))
+answers = apply_schema(
+    pd.read_csv(os.path.join(DATA_DIR, "answers.csv")), DATA_SCHEMAS["answers.csv"]
+)
+demo = apply_schema(
+    pd.read_csv(os.path.join(DATA_DIR, "crt_rme_demo.csv")),
+    DATA_SCHEMAS["crt_rme_demo.csv"],
+)
 statements = pd.read_csv(
     STATEMENTS_PATH,
     usecols=["id", "statement", "statementCategory"],
@@ -61,6 +84,11 @@ merged = answers.merge(
     on="sessionId",
     how="inner",
 )
+# The join key comes back as plain strings; make it categorical again
+apply_schema(merged, DATA_SCHEMAS["answers.csv"])
+# Sorted by time so date ranges are contiguous row ranges (see _filter_date)
+if "createdAt" in merged.columns:
+    merged = merged.sort_values("createdAt", kind="stable", ignore_index=True)
 
 # Country list sorted by participant count
 _countries = (
@@ -70,7 +98,7 @@ _countries = (
     .rename(columns={"country_reside": "country", "count": "n_users"})
     .to_dict(orient="records")
 )
-COUNTRIES_JSON = json.dumps(_countries, ensure_ascii=False).encode("utf-8")
+COUNTRIES_JSON = dumps(_countries)
 
 print(
     f"Ready — {len(demo):,} participants, "
@@ -82,58 +110,298 @@ print(
 # ── Date filter helper ─────────────────────────────────────────────────────
 
 
+def _date_range(df: pd.DataFrame, date_from: str, date_to: str) -> tuple:
+    """Row range [lo, hi) of a frame sorted by createdAt within the date filter.
+
+    Rows without a timestamp sort last and are outside every filtered range.
+    """
+    created = df["createdAt"].to_numpy()
+    if date_from:
+        lo = int(created.searchsorted(pd.Timestamp(date_from).to_datetime64()))
+    else:
+        lo = 0
+    if date_to:
+        end = pd.Timestamp(date_to) + pd.Timedelta(days=1)
+        hi = int(created.searchsorted(end.to_datetime64()))
+    else:
+        hi = int(created.searchsorted(np.datetime64("NaT")))
+    return lo, max(lo, hi)
+
+
 def _filter_date(df: pd.DataFrame, date_from: str, date_to: str) -> pd.DataFrame:
+    """Rows of a frame sorted by createdAt (like `merged`) within the date filter.
+
+    The result is a row slice of `df` found by binary search, not a copy.
+    """
     if not date_from and not date_to:
         return df
     if "createdAt" not in df.columns:
         return df
-    result = df
-    if date_from:
-        result = result[result["createdAt"] >= pd.Timestamp(date_from)]
-    if date_to:
-        result = result[result["createdAt"] < pd.Timestamp(date_to) + pd.Timedelta(days=1)]
-    return result
+    lo, hi = _date_range(df, date_from, date_to)
+    return df.iloc[lo:hi]
+
+
+# ── Integer codes ──────────────────────────────────────────────────────────
+# Sessions, countries and statements are mapped once to dense int32 codes;
+# endpoints filter and group on the code columns of `merged` and decode codes
+# with these lookup tables only when building their JSON payload.
+SESSION_IDS = merged["sessionId"].cat.categories.to_numpy()
+SESSION_INDEX = {name: code for code, name in enumerate(SESSION_IDS)}
+COUNTRY_NAMES = list(merged["country_reside"].cat.categories)
+COUNTRY_INDEX = {name: code for code, name in enumerate(COUNTRY_NAMES)}
+STMT_IDS = np.unique(merged["statementId"].to_numpy())
+
+# Answers without a country get the extra last country code: they count
+# towards "all" but never towards a named country
+NO_COUNTRY = len(COUNTRY_NAMES)
+COUNTRY_LABELS = np.array(COUNTRY_NAMES + [None], dtype=object)
+
+merged["session_code"] = merged["sessionId"].cat.codes.astype(np.int32)
+merged["country_code"] = merged["country_reside"].cat.codes.astype(np.int32)
+merged.loc[merged["country_code"] < 0, "country_code"] = NO_COUNTRY
+merged["stmt_code"] = np.searchsorted(STMT_IDS, merged["statementId"].to_numpy()).astype(
+    np.int32
+)
 
+# Country code of every session (a participant has a single country)
+SESSION_COUNTRY = np.full(len(SESSION_IDS), NO_COUNTRY, dtype=np.int32)
+SESSION_COUNTRY[merged["session_code"].to_numpy()] = merged["country_code"].to_numpy()
 
-# ── Per-country statement aggregation (cached) ─────────────────────────────
-_cache: dict = {}
 
+def _country_rows(df: pd.DataFrame, country: str) -> pd.DataFrame:
+    """Rows of a country, or all rows for "all"; unknown countries match nothing."""
+    if country == "all":
+        return df
+    code = COUNTRY_INDEX.get(country, -1)
+    return df[df["country_code"].to_numpy() == code]
 
-def get_statements(country: str, date_from: str = "", date_to: str = "") -> bytes:
-    key = (country, date_from, date_to)
-    if key in _cache:
-        return _cache[key]
 
-    m = _filter_date(merged, date_from, date_to)
-    subset = m if country == "all" else m[m["country_reside"] == country]
+def _session_counts(rows: pd.DataFrame) -> np.ndarray:
+    """Number of rows of every session code."""
+    return np.bincount(rows["session_code"].to_numpy(), minlength=len(SESSION_IDS))
+
+
+def _n_users(rows: pd.DataFrame) -> int:
+    return int(np.count_nonzero(_session_counts(rows)))
+
+
+def _coded_ratings(rows: pd.DataFrame, cols: list) -> pd.DataFrame:
+    """Rating columns keyed by session code, in the layout of utils' scoring functions."""
+    return rows[["session_code"] + cols].rename(columns={"session_code": "sessionId"})
+
+
+def _decode_sessions(codes) -> pd.Index:
+    return pd.Index(SESSION_IDS[np.asarray(codes)], name="sessionId")
+
+
+# ── Country × statement sufficient statistics ──────────────────────────────
+# For every (country, statement) cell: number of ratings, sum of I_agree, and
+# number and sum of non-missing others_agree. Means and statement scores of any
+# country (or all countries) follow from these without touching answer rows.
+STAT_COLS = ["n_ratings", "I_agree_sum", "others_agree_n", "others_agree_sum"]
+# The cube also counts answers, including those without an I_agree, which the
+# row-count thresholds (value_counts) of the scoring functions include
+CUBE_COLS = STAT_COLS + ["n_answers"]
+N_ANSWERS = CUBE_COLS.index("n_answers")
+
+_row_cell = merged["country_code"].to_numpy() * len(STMT_IDS) + merged[
+    "stmt_code"
+].to_numpy()
+
+# Both ratings are 0/1 flags, so each answer is one of 9 rating states
+# (I_agree 0/1/missing × others_agree 0/1/missing) of its cell. Counting states
+# per cell takes a single bincount; _STATE_STATS turns state counts into
+# STAT_COLS. Answers without an I_agree only count towards others_agree, as in
+# statement_commonsensicality (any value other than 0/1 counts as missing).
+N_STATES = 9
+
+
+def _flag_state(values: pd.Series) -> np.ndarray:
+    """0/1 flags as 0/1, missing (or any other value) as 2."""
+    values = values.to_numpy(dtype=np.float64)
+    return np.where((values == 0) | (values == 1), values, 2).astype(np.int32)
+
+
+_row_state = (
+    _row_cell * N_STATES
+    + _flag_state(merged["I_agree"]) * 3
+    + _flag_state(merged["others_agree"])
+)
+_STATE_STATS = np.array(
+    [
+        # n_ratings, I_agree_sum, others_agree_n, others_agree_sum, n_answers
+        [1, 0, 1, 0, 1],  # I_agree 0, others_agree 0
+        [1, 0, 1, 1, 1],  # I_agree 0, others_agree 1
+        [1, 0, 0, 0, 1],  # I_agree 0, others_agree missing
+        [1, 1, 1, 0, 1],  # I_agree 1, others_agree 0
+        [1, 1, 1, 1, 1],  # I_agree 1, others_agree 1
+        [1, 1, 0, 0, 1],  # I_agree 1, others_agree missing
+        [0, 0, 1, 0, 1],  # I_agree missing, others_agree 0
+        [0, 0, 1, 1, 1],  # I_agree missing, others_agree 1
+        [0, 0, 0, 0, 1],  # I_agree missing, others_agree missing
+    ],
+    dtype=np.float64,
+)
+
+
+def _build_cube(lo: int, hi: int) -> np.ndarray:
+    """Statistics of the answer rows [lo, hi) as a (country, statement, stat) array."""
+    n_cells = (NO_COUNTRY + 1) * len(STMT_IDS)
+    states = np.bincount(_row_state[lo:hi], minlength=n_cells * N_STATES)
+    cube = states.reshape(n_cells, N_STATES).astype(np.float64) @ _STATE_STATS
+    return cube.reshape(NO_COUNTRY + 1, len(STMT_IDS), len(CUBE_COLS))
+
+
+_FULL_CUBE = _build_cube(0, len(merged))
+
+
+def _stats_cube(date_from: str = "", date_to: str = "") -> np.ndarray:
+    """Statistics cube of the answers within a date filter.
+
+    A date range is one contiguous row range of `merged`, so its cube is a
+    single bincount pass over that range. Cubes of date filters are kept in
+    the response cache (_responses) as "stats-cube" entries, so they count
+    towards CACHE_MAX_BYTES and show in /api/cache-stats.
+    """
+    if not date_from and not date_to:
+        return _FULL_CUBE
+    return _responses.get_or_compute(
+        "stats-cube",
+        (date_from, date_to),
+        lambda: _build_cube(*_date_range(merged, date_from, date_to)),
+    )
+
+
+def _country_stats(country: str, date_from: str = "", date_to: str = "") -> np.ndarray:
+    """(statement code, CUBE_COLS) statistics of a country or "all"."""
+    cube = _stats_cube(date_from, date_to)
+    if country == "all":
+        return cube.sum(axis=0)
+    if country in COUNTRY_INDEX:
+        return cube[COUNTRY_INDEX[country]]
+    return np.zeros(cube.shape[1:])
+
+
+def _statement_stats(country: str, date_from: str = "", date_to: str = "") -> pd.DataFrame:
+    """Per-statement statistics (STAT_COLS) of a country or "all", indexed by statementId.
+
+    Only statements with at least one rating are included.
+    """
+    stats = _country_stats(country, date_from, date_to)
+    rated = stats[:, 0] > 0
+    return pd.DataFrame(
+        stats[rated, : len(STAT_COLS)],
+        index=pd.Index(STMT_IDS[rated], name="statementId"),
+        columns=STAT_COLS,
+    )
+
+
+def _stat_means(stats: pd.DataFrame) -> pd.DataFrame:
+    """n_ratings, I_agree_mean and others_agree_mean from per-statement statistics."""
+    return pd.DataFrame(
+        {
+            "n_ratings": stats["n_ratings"].astype(int),
+            "I_agree_mean": stats["I_agree_sum"] / stats["n_ratings"],
+            "others_agree_mean": stats["others_agree_sum"] / stats["others_agree_n"],
+        },
+        index=stats.index,
+    )
+
+
+# ── Per-session answer index ───────────────────────────────────────────────
+# The answers of `merged` regrouped contiguously by session code (in time order
+# within a session), so one user's answers are a slice instead of a full scan.
+# "row" is the answer's position in `merged`, for date filtering.
+_session_rows = np.argsort(merged["session_code"].to_numpy(), kind="stable")
+_session_answers = {
+    "row": _session_rows,
+    "stmt_code": merged["stmt_code"].to_numpy()[_session_rows],
+    "I_agree": merged["I_agree"].to_numpy()[_session_rows],
+    "others_agree": merged["others_agree"].to_numpy()[_session_rows],
+}
+_SESSION_START = np.concatenate(
+    [[0], np.cumsum(np.bincount(merged["session_code"], minlength=len(SESSION_IDS)))]
+)
+_STATEMENT_TEXT = (
+    statements.drop_duplicates("statementId")
+    .set_index("statementId")["statement"]
+    .fillna("")
+    .to_dict()
+)
+
+
+def _user_answers(user_id: str, date_from: str = "", date_to: str = "") -> dict:
+    """Answer arrays (as in _session_answers) of one session within a date filter."""
+    code = SESSION_INDEX.get(user_id)
+    if code is None:
+        return {col: values[:0] for col, values in _session_answers.items()}
+    span = slice(_SESSION_START[code], _SESSION_START[code + 1])
+    answers = {col: values[span] for col, values in _session_answers.items()}
+    if date_from or date_to:
+        lo, hi = _date_range(merged, date_from, date_to)
+        keep = (answers["row"] >= lo) & (answers["row"] < hi)
+        answers = {col: values[keep] for col, values in answers.items()}
+    return answers
+
+
+# ── Response cache ─────────────────────────────────────────────────────────
+# One LRU cache of encoded responses shared by every cached endpoint, bounded
+# by CACHE_MAX_BYTES (default 512 MB)
+_responses = ResponseCache(int(os.environ.get("CACHE_MAX_BYTES", 512 * 1024 * 1024)))
+
+
+def _cached(endpoint: str):
+    """Serve a response function from _responses, keyed by its arguments.
+
+    Concurrent calls with the same arguments share a single computation.
+    """
 
-    n_users = int(subset["sessionId"].nunique())
+    def decorate(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(
+                tuple(sorted(v.items())) if isinstance(v, dict) else v
+                for v in bound.arguments.values()
+            )
+            return _responses.get_or_compute(endpoint, key, lambda: fn(*args, **kwargs))
+
+        return wrapper
+
+    return decorate
+
+
+# ── Per-country statement aggregation (cached) ─────────────────────────────
+
+
+@_cached("statements")
+def get_statements(country: str, date_from: str = "", date_to: str = "") -> bytes:
+    n_users = _n_users(_country_rows(_filter_date(merged, date_from, date_to), country))
 
     agg = (
-        subset.groupby("statementId")
-        .agg(
-            n_ratings=("I_agree", "count"),
-            i_agree_pct=("I_agree", "mean"),
-            others_agree_pct=("others_agree", "mean"),
+        _stat_means(_statement_stats(country, date_from, date_to))
+        .rename(
+            columns={
+                "I_agree_mean": "i_agree_pct",
+                "others_agree_mean": "others_agree_pct",
+            }
         )
         .reset_index()
         .sort_values("n_ratings", ascending=False)
         .merge(statements, on="statementId", how="left")
     )
 
-    agg["i_agree_pct"] = agg["i_agree_pct"].round(4)
-    agg["others_agree_pct"] = agg["others_agree_pct"].round(4)
-    agg["statementId"] = agg["statementId"].astype(int)
-    agg["n_ratings"] = agg["n_ratings"].astype(int)
     agg["statement"] = agg["statement"].fillna("")
     agg["statementCategory"] = agg["statementCategory"].fillna("")
-    for col in PROP_COLS:
-        agg[col] = agg[col].apply(lambda x: int(x) if pd.notna(x) else None)
 
     payload = {
         "n_users": n_users,
         "n_statements": len(agg),
-        "rows": agg[
+        "rows": frame_records(
+            agg,
             [
                 "statementId",
                 "statement",
@@ -142,102 +410,73 @@ def get_statements(country: str, date_from: str = "", date_to: str = "") -> byte
                 "i_agree_pct",
                 "others_agree_pct",
             ]
-            + PROP_COLS
-        ].to_dict(orient="records"),
+            + PROP_COLS,
+            ndigits=4,
+            ints=["statementId", "n_ratings"] + PROP_COLS,
+        ),
     }
 
-    encoded = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    _cache[key] = encoded
-    return encoded
+    return dumps(payload)
 
 
 # ── Individual commonsensicality scores (cached) ───────────────────────────
-_scores_cache: dict = {}
 
 
+@_cached("scores")
 def get_scores(target: str, reference: str, date_from: str = "", date_to: str = "") -> bytes:
-    key = (target, reference, date_from, date_to)
-    if key in _scores_cache:
-        return _scores_cache[key]
-
     m = _filter_date(merged, date_from, date_to)
-    has_ts = "createdAt" in m.columns
-    ans_cols = ["sessionId", "statementId", "I_agree", "others_agree"] + (["createdAt"] if has_ts else [])
-    ref_cols = ["sessionId", "statementId", "I_agree"]
-
-    target_ratings = (
-        m[ans_cols]
-        if target == "all"
-        else m[m["country_reside"] == target][ans_cols]
-    ).copy()
-
-    reference_ratings = (
-        m[ref_cols]
-        if reference == "all"
-        else m[m["country_reside"] == reference][ref_cols]
-    ).copy()
-
-    raw_n_users = int(target_ratings["sessionId"].nunique())
-
-    scores = individual_commonsensicality(target_ratings, reference_ratings)
-
-    # Attach per-user statement count (from the full target data, before scoring filters)
-    stmt_counts = (
-        target_ratings.groupby("sessionId")["statementId"]
-        .count()
-        .rename("n_statements")
-    )
-    scores = scores.join(stmt_counts, how="left")
-    scores["n_statements"] = scores["n_statements"].fillna(0).astype(int)
+    target_rows = _country_rows(m, target)
+    reference_rows = _country_rows(m, reference)
 
-    # Attach per-user country
-    user_country = (
-        m.groupby("sessionId")["country_reside"].first().rename("country")
+    # Per-user statement counts (from the full target data, before scoring filters)
+    n_statements = _session_counts(target_rows)
+    raw_n_users = int(np.count_nonzero(n_statements))
+
+    scores = individual_commonsensicality(
+        _coded_ratings(target_rows, ["statementId", "I_agree", "others_agree"]),
+        _coded_ratings(reference_rows, ["statementId", "I_agree"]),
+        engine="numpy",
     )
-    scores = scores.join(user_country, how="left")
+    codes = scores.index.to_numpy()
+    scores["n_statements"] = n_statements[codes]
+    scores["country"] = COUNTRY_LABELS[SESSION_COUNTRY[codes]]
 
     # Attach per-user first / last answer timestamps
-    if has_ts:
-        ts = target_ratings.groupby("sessionId")["createdAt"].agg(
+    if "createdAt" in m.columns:
+        ts = target_rows.groupby("session_code")["createdAt"].agg(
             first_answer="min", last_answer="max"
         )
-        ts = ts.apply(lambda col: col.dt.strftime("%Y-%m-%d"))
+        for col in ts.columns:
+            days = np.datetime_as_string(ts[col].to_numpy(), unit="D").astype(object)
+            days[ts[col].isna().to_numpy()] = None
+            ts[col] = days
         scores = scores.join(ts, how="left")
+    scores.index = _decode_sessions(codes)
 
     counts, bin_edges = np.histogram(
         scores["commonsensicality"].to_numpy(dtype=float), bins=20, range=(0.0, 1.0)
     )
 
-    float_cols = ["consensus", "awareness", "commonsensicality"]
-    rows_df = scores.reset_index().sort_values("commonsensicality", ascending=False)
-    rows_df[float_cols] = rows_df[float_cols].round(4)
-    rows = rows_df.to_dict(orient="records")
+    rows = frame_records(
+        scores.reset_index().sort_values("commonsensicality", ascending=False),
+        ndigits=4,
+    )
 
     # Excluded users: present in target but didn't qualify for scoring
-    qualifying_ids = set(scores.index)
-    excluded_ids = set(target_ratings["sessionId"].unique()) - qualifying_ids
-    if excluded_ids:
-        excl_counts = (
-            target_ratings[target_ratings["sessionId"].isin(excluded_ids)]
-            .groupby("sessionId")["statementId"]
-            .count()
-            .rename("n_statements")
-        )
-        excl_country = (
-            m[m["sessionId"].isin(excluded_ids)]
-            .groupby("sessionId")["country_reside"]
-            .first()
-            .rename("country")
-        )
-        excl_df = (
-            excl_counts.to_frame()
-            .join(excl_country, how="left")
-            .sort_values("n_statements", ascending=False)
-            .reset_index()
+    excluded = n_statements > 0
+    excluded[codes] = False
+    excluded = np.flatnonzero(excluded)
+    users_excluded = frame_records(
+        pd.DataFrame(
+            {
+                "n_statements": n_statements[excluded],
+                "country": COUNTRY_LABELS[SESSION_COUNTRY[excluded]],
+            },
+            index=_decode_sessions(excluded),
         )
-        users_excluded = excl_df.to_dict(orient="records")
-    else:
-        users_excluded = []
+        .sort_values("n_statements", ascending=False)
+        .reset_index()
+    )
 
     payload = {
         "n_users": len(rows),
@@ -250,74 +489,44 @@ def get_scores(target: str, reference: str, date_from: str = "", date_to: str =
         "users_excluded": users_excluded,
     }
 
-    encoded = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    _scores_cache[key] = encoded
-    return encoded
+    return dumps(payload)
 
 
 # ── Statement-level commonsensicality scores (cached) ─────────────────────
-_stmt_scores_cache: dict = {}
 
 
+@_cached("statement-scores")
 def get_statement_scores(country: str, date_from: str = "", date_to: str = "") -> bytes:
-    key = (country, date_from, date_to)
-    if key in _stmt_scores_cache:
-        return _stmt_scores_cache[key]
+    stats = _statement_stats(country, date_from, date_to)
 
-    m = _filter_date(merged, date_from, date_to)
-    subset = m if country == "all" else m[m["country_reside"] == country]
-    ratings = subset[["statementId", "I_agree", "others_agree"]].copy()
-
-    scores = statement_commonsensicality(ratings)
+    scores = statement_commonsensicality_from_stats(stats)
     scores = scores.join(
         statements.set_index("statementId")[["statement"] + PROP_COLS], how="left"
     )
     scores["statement"] = scores["statement"].fillna("")
-    for col in PROP_COLS:
-        scores[col] = scores[col].apply(lambda x: int(x) if pd.notna(x) else None)
 
-    n_users = int(subset["sessionId"].nunique())
+    n_users = _n_users(_country_rows(_filter_date(merged, date_from, date_to), country))
 
     counts, bin_edges = np.histogram(
         scores["commonsensicality"].to_numpy(dtype=float), bins=20, range=(0.0, 1.0)
     )
 
-    float_cols = [
-        "I_agree_mean",
-        "others_agree_mean",
-        "consensus",
-        "awareness",
-        "commonsensicality",
-    ]
-    rows_df = scores.reset_index().sort_values("commonsensicality", ascending=False)
-    rows_df[float_cols] = rows_df[float_cols].round(4)
-    rows = rows_df.to_dict(orient="records")
+    rows = frame_records(
+        scores.reset_index().sort_values("commonsensicality", ascending=False),
+        ndigits=4,
+        ints=PROP_COLS,
+    )
 
     # Excluded statements: have ratings but fewer than the minimum
-    qualifying_stmt_ids = set(scores.index)
-    excl_agg = (
-        subset.groupby("statementId")
-        .agg(
-            n_ratings=("I_agree", "count"),
-            I_agree_mean=("I_agree", "mean"),
-            others_agree_mean=("others_agree", "mean"),
-        )
-        .reset_index()
-    )
-    excl_agg = excl_agg[~excl_agg["statementId"].isin(qualifying_stmt_ids)].copy()
+    excl_agg = _stat_means(stats.drop(index=scores.index)).reset_index()
     excl_agg = excl_agg.merge(
         statements.set_index("statementId")[["statement"] + PROP_COLS],
         on="statementId", how="left",
     )
     excl_agg["statement"] = excl_agg["statement"].fillna("")
-    for col in PROP_COLS:
-        excl_agg[col] = excl_agg[col].apply(lambda x: int(x) if pd.notna(x) else None)
-    excl_agg["I_agree_mean"] = excl_agg["I_agree_mean"].round(4)
-    excl_agg["others_agree_mean"] = excl_agg["others_agree_mean"].round(4)
-    excl_agg["n_ratings"] = excl_agg["n_ratings"].astype(int)
-    excl_agg["statementId"] = excl_agg["statementId"].astype(int)
-    excl_agg = excl_agg.sort_values("n_ratings", ascending=False)
-    rows_excluded = excl_agg.to_dict(orient="records")
+    rows_excluded = frame_records(
+        excl_agg.sort_values("n_ratings", ascending=False), ndigits=4, ints=PROP_COLS
+    )
 
     payload = {
         "n_statements": len(rows),
@@ -330,14 +539,10 @@ def get_statement_scores(country: str, date_from: str = "", date_to: str = "") -
         "rows_excluded": rows_excluded,
     }
 
-    encoded = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    _stmt_scores_cache[key] = encoded
-    return encoded
+    return dumps(payload)
 
 
 # ── Design-point commonsensicality (cached) ───────────────────────────────
-_dp_cache: dict = {}
-
 try:
     from scipy.stats import t as _scipy_t
 
@@ -368,38 +573,53 @@ except ImportError:
         return 12.706
 
 
-def get_design_points(country: str, date_from: str = "", date_to: str = "") -> bytes:
-    key = (country, date_from, date_to)
-    if key in _dp_cache:
-        return _dp_cache[key]
+# Design point of every statement: its PROP_COLS flags packed into one 6-bit
+# code, first column in the highest bit, so codes 0..63 enumerate the design
+# points in itertools.product([0, 1], repeat=6) order. Statements with a
+# missing (or non 0/1) property have no design point and get -1.
+DP_BITS = {col: len(PROP_COLS) - 1 - i for i, col in enumerate(PROP_COLS)}
+N_DESIGN_POINTS = 2 ** len(PROP_COLS)
+_stmt_props = statements.drop_duplicates("statementId").set_index("statementId")[PROP_COLS]
+DP_CODES = sum(
+    _stmt_props[col].fillna(0).astype(np.int32) * (1 << bit)
+    for col, bit in DP_BITS.items()
+).where(_stmt_props.isin([0, 1]).all(axis=1), -1)
 
-    m = _filter_date(merged, date_from, date_to)
-    subset = m if country == "all" else m[m["country_reside"] == country]
-    ratings = subset[["statementId", "I_agree", "others_agree"]].copy()
 
-    scores = statement_commonsensicality(ratings)
-    scores = scores.join(statements.set_index("statementId")[PROP_COLS], how="left")
-    scores = scores.dropna(subset=PROP_COLS)
-    for col in PROP_COLS:
-        scores[col] = scores[col].astype(int)
+def _dp_codes(stmt_ids: pd.Index) -> pd.Series:
+    """Design-point codes of statements, -1 for statements without one."""
+    return DP_CODES.reindex(stmt_ids, fill_value=-1)
+
+
+@_cached("design-points")
+def get_design_points(country: str, date_from: str = "", date_to: str = "") -> bytes:
+    scores = statement_commonsensicality_from_stats(
+        _statement_stats(country, date_from, date_to)
+    )
+    codes = _dp_codes(scores.index)
+    has_dp = codes.to_numpy() >= 0
+
+    # n, mean and std of all design points in one group-by over the codes
+    groups = (
+        scores.loc[has_dp, "commonsensicality"]
+        .groupby(codes[has_dp])
+        .agg(["count", "mean", "std"])
+        .reindex(range(N_DESIGN_POINTS))
+    )
 
     rows_with_data, rows_no_data = [], []
 
-    for vals in itertools.product([0, 1], repeat=len(PROP_COLS)):
-        mask = pd.Series(True, index=scores.index)
-        for col, val in zip(PROP_COLS, vals):
-            mask &= scores[col] == val
-        group = scores[mask]["commonsensicality"]
-        n = int(len(group))
+    for code, count, mean, std in groups.itertuples():
+        n = 0 if np.isnan(count) else int(count)
 
-        props = {col: int(v) for col, v in zip(PROP_COLS, vals)}
+        props = {col: (code >> bit) & 1 for col, bit in DP_BITS.items()}
         row = {**props, "n": n, "mean": None, "ci_lo": None, "ci_hi": None}
 
         if n >= 1:
-            m = float(group.mean())
+            m = float(mean)
             row["mean"] = round(m, 4)
         if n >= 2:
-            s = float(group.std())
+            s = float(std)
             margin = _t_crit(n - 1) * s / np.sqrt(n)
             row["ci_lo"] = round(max(0.0, m - margin), 4)
             row["ci_hi"] = round(min(1.0, m + margin), 4)
@@ -410,38 +630,26 @@ def get_design_points(country: str, date_from: str = "", date_to: str = "") -> b
     rows_no_data.sort(key=lambda r: r["n"], reverse=True)
 
     payload = {"rows": rows_with_data, "rows_excluded": rows_no_data}
-    encoded = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    _dp_cache[key] = encoded
-    return encoded
+    return dumps(payload)
 
 
 # ── Statements for a single design point (cached) ─────────────────────────
-_dp_stmts_cache: dict = {}
 
 
+@_cached("dp-statements")
 def get_dp_statements(country: str, props: dict, date_from: str = "", date_to: str = "") -> bytes:
-    cache_key = (country, date_from, date_to) + tuple(props[col] for col in PROP_COLS)
-    if cache_key in _dp_stmts_cache:
-        return _dp_stmts_cache[cache_key]
-
-    m = _filter_date(merged, date_from, date_to)
-    subset = m if country == "all" else m[m["country_reside"] == country]
-    ratings = subset[["statementId", "I_agree", "others_agree"]].copy()
-
-    scores = statement_commonsensicality(ratings)
-    scores = scores.join(
-        statements.set_index("statementId")[["statement"] + PROP_COLS], how="left"
+    scores = statement_commonsensicality_from_stats(
+        _statement_stats(country, date_from, date_to)
     )
-    scores = scores.dropna(subset=PROP_COLS)
-    for col in PROP_COLS:
-        scores[col] = scores[col].astype(int)
-
-    mask = pd.Series(True, index=scores.index)
-    for col, val in props.items():
-        mask &= scores[col] == val
+    # Statements whose code has the requested bits
+    if not set(props.values()) <= {0, 1}:
+        return dumps({"n": 0, "rows": []})
+    bits = sum(1 << DP_BITS[col] for col in props)
+    value = sum(val << DP_BITS[col] for col, val in props.items())
+    codes = _dp_codes(scores.index).to_numpy()
 
-    filtered = scores[mask].copy()
-    filtered["statement"] = filtered["statement"].fillna("")
+    filtered = scores[(codes >= 0) & (codes & bits == value)].copy()
+    filtered["statement"] = filtered.index.map(_STATEMENT_TEXT).fillna("")
 
     float_cols = [
         "I_agree_mean",
@@ -450,42 +658,39 @@ def get_dp_statements(country: str, props: dict, date_from: str = "", date_to: s
         "awareness",
         "commonsensicality",
     ]
-    rows_df = filtered.reset_index().sort_values("n_ratings", ascending=False)
-    rows_df[float_cols] = rows_df[float_cols].round(4)
-    rows_df["n_ratings"] = rows_df["n_ratings"].astype(int)
-    rows_df["statementId"] = rows_df["statementId"].astype(int)
-
-    rows = rows_df[["statementId", "statement", "n_ratings"] + float_cols].to_dict(
-        orient="records"
+    rows = frame_records(
+        filtered.reset_index().sort_values("n_ratings", ascending=False),
+        ["statementId", "statement", "n_ratings"] + float_cols,
+        ndigits=4,
     )
 
     payload = {"n": len(rows), "rows": rows}
-    encoded = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    _dp_stmts_cache[cache_key] = encoded
-    return encoded
+    return dumps(payload)
 
 
 # ── Country × statement commonsensicality matrix (cached) ────────────────
-_country_matrix_cache: dict = {}
 
 
+@_cached("country-matrix")
 def get_country_matrix(date_from: str = "", date_to: str = "") -> bytes:
-    key = (date_from, date_to)
-    if key in _country_matrix_cache:
-        return _country_matrix_cache[key]
-
     MIN_RATINGS = 10
-    m = _filter_date(merged, date_from, date_to)
 
-    agg_all = (
-        m.groupby(["country_reside", "statementId"])
-        .agg(
-            n_ratings=("I_agree", "count"),
-            I_agree_mean=("I_agree", "mean"),
-            others_agree_mean=("others_agree", "mean"),
+    # Every rated (country, statement) cell, in country then statement order
+    cube = _stats_cube(date_from, date_to)[:NO_COUNTRY]
+    country_codes, stmt_codes = np.nonzero(cube[:, :, 0])
+    cells = cube[country_codes, stmt_codes]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        agg_all = pd.DataFrame(
+            {
+                "country_reside": pd.Categorical.from_codes(
+                    country_codes, categories=COUNTRY_NAMES
+                ),
+                "statementId": STMT_IDS[stmt_codes],
+                "n_ratings": cells[:, 0].astype(int),
+                "I_agree_mean": cells[:, 1] / cells[:, 0],
+                "others_agree_mean": cells[:, 3] / cells[:, 2],
+            }
         )
-        .reset_index()
-    )
     agg = agg_all[agg_all["n_ratings"] >= MIN_RATINGS].copy()
 
     agg["consensus"] = 2 * np.abs(agg["I_agree_mean"] - 0.5)
@@ -499,7 +704,7 @@ def get_country_matrix(date_from: str = "", date_to: str = "") -> bytes:
     agg["score"] = (np.sqrt(agg["consensus"] * agg["awareness"]) * 100).round(2)
 
     # Columns: countries sorted by number of qualifying statements (desc)
-    country_counts = agg.groupby("country_reside").size().sort_values(ascending=False)
+    country_counts = agg.groupby("country_reside", observed=True).size().sort_values(ascending=False)
     countries = country_counts.index.tolist()
 
     # Rows: statements sorted by number of qualifying countries (desc)
@@ -558,35 +763,31 @@ def get_country_matrix(date_from: str = "", date_to: str = "") -> bytes:
         "country_n_statements": {c: int(country_counts[c]) for c in countries},
         "rows": rows,
     }
-    encoded = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    _country_matrix_cache[key] = encoded
-    return encoded
+    return dumps(payload)
 
 
 # ── Country cell detail (no cache — lightweight per-cell query) ──────────
 
 
 def get_country_cell(stmt_id: int, country: str, date_from: str = "", date_to: str = "") -> bytes:
-    m = _filter_date(merged, date_from, date_to)
-    mask = (m["statementId"] == stmt_id) & (m["country_reside"] == country)
-    sub = m[mask]
-    if len(sub) < 10:
-        return json.dumps({"error": "not enough ratings"}).encode("utf-8")
-    n = int(len(sub))
-    I_agree_mean = float(sub["I_agree"].mean())
-    others_agree_mean = float(sub["others_agree"].mean())
+    stats = _statement_stats(country, date_from, date_to)
+    if stmt_id not in stats.index or stats.at[stmt_id, "n_ratings"] < 10:
+        return dumps({"error": "not enough ratings"})
+    cell = _stat_means(stats.loc[[stmt_id]]).iloc[0]
+    n = int(cell["n_ratings"])
+    I_agree_mean = float(cell["I_agree_mean"])
+    others_agree_mean = float(cell["others_agree_mean"])
     stmt_rows = statements[statements["statementId"] == stmt_id]
     stmt_text = str(stmt_rows["statement"].iloc[0]) if len(stmt_rows) > 0 else ""
-    return json.dumps(
+    return dumps(
         {
             "statementId": stmt_id,
             "statement": stmt_text,
             "n_ratings": n,
             "I_agree_mean": I_agree_mean,
             "others_agree_mean": others_agree_mean,
-        },
-        ensure_ascii=False,
-    ).encode("utf-8")
+        }
+    )
 
 
 # ── User detail (no cache — lightweight per-user query) ───────────────────
@@ -595,135 +796,95 @@ def get_country_cell(stmt_id: int, country: str, date_from: str = "", date_to: s
 def get_user_detail(user_id: str, reference: str, target: str, date_from: str = "", date_to: str = "") -> bytes:
     MIN_RATINGS = 10
 
-    m = _filter_date(merged, date_from, date_to)
-    user_ratings = m[m["sessionId"] == user_id][
-        ["statementId", "I_agree", "others_agree"]
-    ].copy()
+    user = _user_answers(user_id, date_from, date_to)
 
-    if user_ratings.empty:
-        return json.dumps(
-            {"rows": [], "n_scoring": 0, "A": 0, "B": 0}, ensure_ascii=False
-        ).encode("utf-8")
+    if len(user["row"]) == 0:
+        return dumps({"rows": [], "n_scoring": 0, "A": 0, "B": 0})
 
-    stmt_ids = user_ratings["statementId"].unique()
+    # Per-statement counts and reference averages of the user's statements, from
+    # the (cached) statistics cube
+    stmts = user["stmt_code"]
+    target_n = _country_stats(target, date_from, date_to)[stmts, N_ANSWERS]
+    ref = _country_stats(reference, date_from, date_to)[stmts]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ref_i_agree_mean = ref[:, 1] / ref[:, 0]
+        ref_others_agree_mean = ref[:, 3] / ref[:, 2]
 
     # ── Compute A, B, N using the exact same filtering as individual_commonsensicality
-    target_group = (
-        m if target == "all" else m[m["country_reside"] == target]
-    )
-    ref_group = (
-        m if reference == "all" else m[m["country_reside"] == reference]
-    )
-
-    target_counts = target_group["statementId"].value_counts()
-    ref_counts = ref_group["statementId"].value_counts()
-    valid_target = target_counts[target_counts >= MIN_RATINGS].index
-    valid_ref = ref_counts[ref_counts >= MIN_RATINGS].index
-    common_stmts = set(valid_target) & set(valid_ref)
-
-    ref_avg = (
-        ref_group[ref_group["statementId"].isin(common_stmts)]
-        .groupby("statementId")["I_agree"]
-        .mean()
-    )
-    maj_vote = (ref_avg >= 0.5).astype(int)
-
-    user_qual = user_ratings[user_ratings["statementId"].isin(common_stmts)].merge(
-        maj_vote.rename("maj_vote"), on="statementId", how="inner"
-    )
+    qualifying = (target_n >= MIN_RATINGS) & (ref[:, N_ANSWERS] >= MIN_RATINGS)
+    maj_vote = (ref_i_agree_mean >= 0.5).astype(int)
     MIN_STMTS_USER = 5
-    N_scoring = int(len(user_qual))  # qualifying count (may be < 5)
+    N_scoring = int(qualifying.sum())  # qualifying count (may be < 5)
     disqualified = N_scoring < MIN_STMTS_USER
     A = (
-        int((user_qual["I_agree"] == user_qual["maj_vote"]).sum())
+        int((user["I_agree"] == maj_vote)[qualifying].sum())
         if not disqualified
         else 0
     )
     B = (
-        int((user_qual["others_agree"] == user_qual["maj_vote"]).sum())
+        int((user["others_agree"] == maj_vote)[qualifying].sum())
         if not disqualified
         else 0
     )
 
     # ── Full display rows (all rated statements with reference averages) ───────
-    ref_agg = (
-        ref_group[ref_group["statementId"].isin(stmt_ids)]
-        .groupby("statementId")
-        .agg(
-            ref_n_ratings=("I_agree", "count"),
-            ref_i_agree_mean=("I_agree", "mean"),
-            ref_others_agree_mean=("others_agree", "mean"),
-        )
-        .reset_index()
-        .round(4)
-    )
+    def _value(x, ndigits=4):
+        return None if np.isnan(x) else round(float(x), ndigits)
 
-    result = user_ratings.merge(ref_agg, on="statementId", how="left").merge(
-        statements[["statementId", "statement"]], on="statementId", how="left"
-    )
-    result["statement"] = result["statement"].fillna("")
-    result["I_agree"] = result["I_agree"].astype(int)
-    result["others_agree"] = result["others_agree"].astype(int)
-    result["statementId"] = result["statementId"].astype(int)
-
-    rows = [
-        {k: (None if pd.isna(v) else v) for k, v in r.items()}
-        for r in result.sort_values("statementId").to_dict(orient="records")
-    ]
-    return json.dumps(
+    rows = []
+    for i in np.argsort(STMT_IDS[stmts], kind="stable"):
+        stmt_id = int(STMT_IDS[stmts[i]])
+        rows.append(
+            {
+                "statementId": stmt_id,
+                "I_agree": _value(user["I_agree"][i], None),
+                "others_agree": _value(user["others_agree"][i], None),
+                "ref_n_ratings": int(ref[i, 0]) if ref[i, 0] > 0 else None,
+                "ref_i_agree_mean": _value(ref_i_agree_mean[i]),
+                "ref_others_agree_mean": _value(ref_others_agree_mean[i]),
+                "statement": _STATEMENT_TEXT.get(stmt_id, ""),
+            }
+        )
+    return dumps(
         {
             "rows": rows,
             "n_scoring": N_scoring,
             "A": A,
             "B": B,
             "disqualified": disqualified,
-        },
-        ensure_ascii=False,
-    ).encode("utf-8")
-
-
-_compare_cache: dict = {}
+        }
+    )
 
 
+@_cached("group-compare")
 def get_group_compare(group_a: str, group_b: str, date_from: str = "", date_to: str = "") -> bytes:
-    key = (group_a, group_b, date_from, date_to)
-    if key in _compare_cache:
-        return _compare_cache[key]
-
     m = _filter_date(merged, date_from, date_to)
 
-    def filter_group(g):
-        return m if g == "all" else m[m["country_reside"] == g]
-
     def indiv_detail(g):
-        data = filter_group(g)
-        raw_n = int(data["sessionId"].nunique()) if not data.empty else 0
+        data = _country_rows(m, g)
         if data.empty:
             return [], 0
+        raw_n = _n_users(data)
         try:
-            df = individual_commonsensicality(data, data)[
+            ratings = _coded_ratings(data, ["statementId", "I_agree", "others_agree"])
+            df = individual_commonsensicality(ratings, ratings, engine="numpy")[
                 ["consensus", "awareness", "commonsensicality"]
             ]
-            df = df.round(4)
-            items = [
-                {
-                    "userId": str(uid),
-                    "consensus": float(row["consensus"]),
-                    "awareness": float(row["awareness"]),
-                    "score": float(row["commonsensicality"]),
-                }
-                for uid, row in df.iterrows()
-            ]
+            df.index = _decode_sessions(df.index).rename("userId")
+            items = frame_records(
+                df.rename(columns={"commonsensicality": "score"}).reset_index(),
+                ndigits=4,
+            )
             return items, raw_n
         except Exception:
             return [], raw_n
 
     def stmt_detail(g):
-        data = filter_group(g)
-        if data.empty:
+        stats = _statement_stats(g, date_from, date_to)
+        if stats.empty:
             return pd.DataFrame(), []
         try:
-            df = statement_commonsensicality(data)
+            df = statement_commonsensicality_from_stats(stats)
             detail = (
                 df[
                     [
@@ -741,17 +902,18 @@ def get_group_compare(group_a: str, group_b: str, date_from: str = "", date_to:
                 )
             )
             detail["statement"] = detail["statement"].fillna("")
-            items = [
-                {
-                    "statementId": int(r["statementId"]),
-                    "statement": str(r["statement"]),
-                    "n_ratings": int(r["n_ratings"]),
-                    "I_agree_mean": round(float(r["I_agree_mean"]), 4),
-                    "others_agree_mean": round(float(r["others_agree_mean"]), 4),
-                    "score": round(float(r["commonsensicality"]), 4),
-                }
-                for _, r in detail.iterrows()
-            ]
+            items = frame_records(
+                detail.rename(columns={"commonsensicality": "score"}),
+                [
+                    "statementId",
+                    "statement",
+                    "n_ratings",
+                    "I_agree_mean",
+                    "others_agree_mean",
+                    "score",
+                ],
+                ndigits=4,
+            )
             return df, items
         except Exception:
             return pd.DataFrame(), []
@@ -780,14 +942,12 @@ def get_group_compare(group_a: str, group_b: str, date_from: str = "", date_to:
                     how="left",
                 )
             )
-            df["score_a"] = df["score_a"].round(4)
-            df["score_b"] = df["score_b"].round(4)
             df["statement"] = df["statement"].fillna("")
-            paired = df[["statementId", "statement", "score_a", "score_b"]].to_dict(
-                orient="records"
+            paired = frame_records(
+                df, ["statementId", "statement", "score_a", "score_b"], ndigits=4
             )
 
-    result = json.dumps(
+    result = dumps(
         {
             "individuals": {
                 "a": indiv_a,
@@ -796,41 +956,146 @@ def get_group_compare(group_a: str, group_b: str, date_from: str = "", date_to:
                 "raw_n_b": raw_n_b,
             },
             "statements": {"a": stmt_a_items, "b": stmt_b_items, "paired": paired},
-        },
-        ensure_ascii=False,
-    ).encode("utf-8")
-    _compare_cache[key] = result
+        }
+    )
     return result
 
 
 def get_statement_countries(stmt_id: str, date_from: str = "", date_to: str = "") -> bytes:
     if not stmt_id:
-        return json.dumps([], ensure_ascii=False).encode("utf-8")
+        return dumps([])
     try:
         sid = int(stmt_id)
     except ValueError:
-        return json.dumps([], ensure_ascii=False).encode("utf-8")
-    m = _filter_date(merged, date_from, date_to)
-    rows = (
-        m[m["statementId"] == sid]["country_reside"]
-        .value_counts()
+        return dumps([])
+    stmt_code = np.searchsorted(STMT_IDS, sid)
+    if stmt_code == len(STMT_IDS) or STMT_IDS[stmt_code] != sid:
+        return dumps([])
+    counts = pd.Series(
+        _stats_cube(date_from, date_to)[:NO_COUNTRY, stmt_code, N_ANSWERS].astype(np.int64),
+        index=pd.Index(COUNTRY_NAMES, name="country"),
+        name="n_ratings",
+    )
+    rows = frame_records(
+        counts.sort_values(ascending=False)
+        .loc[lambda counts: counts > 0]
         .head(5)
         .reset_index()
-        .rename(columns={"country_reside": "country", "count": "n_ratings"})
-        .to_dict(orient="records")
     )
-    return json.dumps(rows, ensure_ascii=False).encode("utf-8")
+    return dumps(rows)
+
+
+# ── Compression and ETags ──────────────────────────────────────────────────
+# Responses only change when the data files (or the code computing them)
+# change, so a strong ETag is a hash of that snapshot plus the request's path
+# and query, known before the response is computed.
+_SNAPSHOT_FILES = [
+    os.path.join(DATA_DIR, "answers.csv"),
+    os.path.join(DATA_DIR, "crt_rme_demo.csv"),
+    os.path.join(DATA_DIR, "statement_properties.csv"),
+    STATEMENTS_PATH,
+    os.path.join(BASE_DIR, "server.py"),
+    os.path.join(BASE_DIR, "utils.py"),
+    os.path.join(BASE_DIR, "json_payload.py"),
+]
+# The encoder is part of the version too: orjson and json format differently
+SNAPSHOT_VERSION = hashlib.sha1(
+    json.dumps(
+        [(f, os.stat(f).st_size, os.stat(f).st_mtime_ns) for f in _SNAPSHOT_FILES]
+        + [ENCODER]
+    ).encode("utf-8")
+).hexdigest()[:16]
+
+# Smaller bodies are not worth the compression overhead
+MIN_COMPRESS_BYTES = 1024
+# Supported content codings, most preferred first
+# (mtime=0 keeps gzip output byte-identical, as a strong ETag requires)
+_ENCODERS = {"gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0)}
+if brotli is not None:
+    _ENCODERS = {"br": lambda body: brotli.compress(body, quality=5), **_ENCODERS}
+# Endpoints whose response changes without the data changing
+_UNVERSIONED_PATHS = {"/api/cache-stats"}
+
+
+def _negotiate_encoding(accept_encoding: str):
+    """Preferred supported content coding allowed by an Accept-Encoding header, or None."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    for coding in _ENCODERS:
+        if coding in accepted or "*" in accepted:
+            return coding
+    return None
+
+
+def _etag(parsed: urllib.parse.ParseResult) -> str:
+    query = sorted(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+    key = json.dumps([SNAPSHOT_VERSION, parsed.path, query])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
 
 
 # ── HTTP handler ───────────────────────────────────────────────────────────
 class Handler(http.server.SimpleHTTPRequestHandler):
+    # Set per request by _handle_GET for versioned API responses
+    _etag_base = None
+    _encoding = None
+
+    def _entity_tag(self) -> str:
+        """Strong ETag of the response, distinct per content coding."""
+        suffix = f"-{self._encoding}" if self._encoding else ""
+        return f'"{self._etag_base}{suffix}"'
+
+    def _not_modified(self) -> bool:
+        """Whether the client's If-None-Match already holds this response."""
+        header = self.headers.get("If-None-Match")
+        if not header or self._etag_base is None:
+            return False
+        tags = {tag.strip() for tag in header.split(",")}
+        if "*" in tags or self._entity_tag() in tags:
+            return True
+        # Small bodies are sent uncompressed, under the tag without a coding
+        encoding, self._encoding = self._encoding, None
+        if self._entity_tag() in tags:
+            return True
+        self._encoding = encoding
+        return False
+
     def _send_json(self, body: bytes):
         self.send_response(200)
         self.send_header("Content-Type", "application/json; charset=utf-8")
+        if self._etag_base is not None:
+            if self._encoding and len(body) >= MIN_COMPRESS_BYTES:
+                # Compressed bodies share the response cache with the raw ones
+                body = _responses.get_or_compute(
+                    self._encoding,
+                    self._etag_base,
+                    lambda: _ENCODERS[self._encoding](body),
+                )
+                self.send_header("Content-Encoding", self._encoding)
+            else:
+                self._encoding = None
+            self.send_header("ETag", self._entity_tag())
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
 
+    def _send_not_modified(self):
+        self.send_response(304)
+        self.send_header("ETag", self._entity_tag())
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
     def _send_error_json(self, code: int, message: str):
         body = json.dumps({"error": message}).encode("utf-8")
         self.send_response(code)
@@ -857,8 +1122,17 @@ class Handler(http.server.SimpleHTTPRequestHandler):
         date_from = params.get("date_from", [""])[0]
         date_to = params.get("date_to", [""])[0]
 
+        if parsed.path.startswith("/api/") and parsed.path not in _UNVERSIONED_PATHS:
+            self._etag_base = _etag(parsed)
+            self._encoding = _negotiate_encoding(self.headers.get("Accept-Encoding", ""))
+            if self._not_modified():
+                self._send_not_modified()
+                return
+
         if parsed.path == "/api/countries":
             self._send_json(COUNTRIES_JSON)
+        elif parsed.path == "/api/cache-stats":
+            self._send_json(dumps(_responses.stats()))
         elif parsed.path == "/api/statements":
             country = params.get("country", ["all"])[0]
             self._send_json(get_statements(country, date_from, date_to))
@@ -912,12 +1186,47 @@ class Handler(http.server.SimpleHTTPRequestHandler):
             print(" ", args[0], args[1])
 
 
+# ── Server ─────────────────────────────────────────────────────────────────
+class PooledHTTPServer(http.server.HTTPServer):
+    """HTTPServer that handles each connection on a bounded pool of threads.
+
+    A slow uncached computation occupies one worker while the others keep
+    serving static files and cached responses.
+    """
+
+    # Listen backlog; HTTPServer's default of 5 drops connections under load
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, workers: int = SERVER_WORKERS):
+        super().__init__(server_address, handler_class)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="http"
+        )
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
 # ── Entry point ────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     os.chdir(BASE_DIR)
-    httpd = http.server.HTTPServer(("", PORT), Handler)
-    print(f"Open http://localhost:{PORT}")
+    httpd = PooledHTTPServer(("", PORT), Handler)
+    print(f"Open http://localhost:{PORT} ({SERVER_WORKERS} workers)")
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nStopped.")
+    finally:
+        httpd.server_close()
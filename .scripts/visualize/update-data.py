@@ -1,9 +1,18 @@
 import json
 import os
 import re
+import sys
 
 import pandas as pd
 
+# Shared chunk loader from .scripts/utils (imported as a plain module, since
+# this folder has its own utils.py)
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils")
+)
+from load_data import read_table_chunks  # noqa: E402
+from score_store import STORE_FILENAME, ScoreStore, latest_answers  # noqa: E402
+
 if not os.path.exists("data"):
     os.makedirs("data")
 
@@ -289,11 +298,7 @@ def _code_to_country(code):
 
 
 def _read_csvs(base_path):
-    files = sorted(f for f in os.listdir(base_path) if f.endswith(".csv"))
-    return pd.concat(
-        [pd.read_csv(os.path.join(base_path, f)) for f in files],
-        ignore_index=True,
-    )
+    return read_table_chunks(base_path)
 
 
 def _prep_individuals(df, info_types):
@@ -333,13 +338,12 @@ df_answers = _read_csvs("../../answers")
 df_answers.rename(columns={"sessionId": "sessionId"}, inplace=True)
 df_answers["createdAt"] = pd.to_datetime(df_answers["createdAt"])
 
-df_answers = df_answers[
-    ["sessionId", "statementId", "I_agree", "others_agree", "createdAt"]
+# Every answer row is kept for the score store, which reads the new ones by id
+answer_rows = df_answers[
+    ["id", "sessionId", "statementId", "I_agree", "others_agree", "createdAt"]
 ]
-df_answers.sort_values("createdAt", inplace=True)
-df_answers.drop_duplicates(
-    subset=["sessionId", "statementId"], keep="last", inplace=True
-)
+del df_answers
+df_answers = latest_answers(answer_rows).drop(columns=["id"])
 # df_answers.drop(columns=["createdAt"], inplace=True)
 
 # Sessions with consistent IDs across all sources (pre-bug / post-bug cohort):
@@ -496,3 +500,32 @@ df_collated.loc[override_mask, "country_reside"] = besample_country[override_mas
 
 df_collated.to_csv("data/crt_rme_demo.csv")
 print("\nSaved collated CRT/RME/Demo data to data/crt_rme_demo.csv")
+
+print("\n" + "=" * 80)
+print("\nUpdating score store...")
+
+# Scores of the matched sessions, updated from the answers added since the last
+# run. Set SCORE_STORE_VERIFY=1 to check them against a full recompute.
+store_path = os.path.join("data", STORE_FILENAME)
+store = ScoreStore.load(store_path)
+previous_id = store.last_id
+scored_countries = df_collated["country_reside"].reindex(
+    pd.Index(df_answers["sessionId"].astype(str).unique())
+)
+changed = store.update(answer_rows, scored_countries)
+print(
+    f"  answers after id {previous_id:,} read, "
+    f"{len(changed):,} statements re-tallied after a vote change"
+)
+if os.environ.get("SCORE_STORE_VERIFY") == "1":
+    ratings = df_answers.assign(
+        country_reside=df_answers["sessionId"].astype(str).map(scored_countries)
+    )
+    if store.verify(ratings):
+        print("  Score store matches a full recompute")
+    else:
+        print("  Score store differs from a full recompute, rebuilding it")
+        store = ScoreStore()
+        store.update(answer_rows, scored_countries)
+store.save(store_path)
+print(f"\nSaved score store to {store_path}")